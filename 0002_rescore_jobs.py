@@ -0,0 +1,34 @@
+"""rescore jobs
+
+Revision ID: 0002_rescore_jobs
+Revises: 0001_init
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_rescore_jobs"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "rescore_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.Enum("pending","running","completed","failed", name="jobstatus"), nullable=False, server_default="pending"),
+        sa.Column("requested_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("last_metric_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_scanned", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_changed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_per_second", sa.Float(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+def downgrade() -> None:
+    op.drop_table("rescore_jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
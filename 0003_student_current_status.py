@@ -0,0 +1,57 @@
+"""student current status projection
+
+Revision ID: 0003_student_current_status
+Revises: 0002_rescore_jobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0003_student_current_status"
+down_revision = "0002_rescore_jobs"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_student_metrics_student_id_as_of_date",
+        "student_metrics",
+        ["student_id", sa.text("as_of_date DESC")],
+    )
+
+    op.create_table(
+        "student_current_status",
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id"), primary_key=True),
+        sa.Column("metric_id", sa.Integer(), nullable=False),
+        sa.Column("as_of_date", sa.Date(), nullable=False),
+        sa.Column("attendance_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("academic_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("graduation_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("risk_flag_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("student_status", postgresql.ENUM("on_track","watch","at_risk","high_risk", name="studentstatus", create_type=False), nullable=False, server_default="on_track"),
+        sa.Column("intervention_required", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+    op.create_index("ix_student_current_status_metric_id", "student_current_status", ["metric_id"])
+
+    # Backfill from existing history (same query as `python -m app.manage backfill-current-status`).
+    op.execute("""
+        INSERT INTO student_current_status (
+            student_id, metric_id, as_of_date,
+            attendance_risk_flag, academic_risk_flag, graduation_risk_flag,
+            risk_flag_count, student_status, intervention_required
+        )
+        SELECT DISTINCT ON (student_id)
+            student_id, id, as_of_date,
+            attendance_risk_flag, academic_risk_flag, graduation_risk_flag,
+            risk_flag_count, student_status, intervention_required
+        FROM student_metrics
+        ORDER BY student_id, as_of_date DESC
+    """)
+
+def downgrade() -> None:
+    op.drop_index("ix_student_current_status_metric_id", table_name="student_current_status")
+    op.drop_table("student_current_status")
+    op.drop_index("ix_student_metrics_student_id_as_of_date", table_name="student_metrics")
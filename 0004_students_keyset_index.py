@@ -0,0 +1,19 @@
+"""students keyset pagination index
+
+Revision ID: 0004_students_keyset_index
+Revises: 0003_student_current_status
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "0004_students_keyset_index"
+down_revision = "0003_student_current_status"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index("ix_students_name_id", "students", ["last_name", "first_name", "id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_students_name_id", table_name="students")
@@ -0,0 +1,38 @@
+"""risk rollups
+
+Revision ID: 0005_risk_rollups
+Revises: 0004_students_keyset_index
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_risk_rollups"
+down_revision = "0004_students_keyset_index"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "risk_rollups",
+        sa.Column("as_of_date", sa.Date(), nullable=False),
+        sa.Column("grade_level", sa.Integer(), nullable=False),
+        sa.Column("diploma_path", sa.String(length=80), nullable=False, server_default=""),
+        sa.Column("student_status", postgresql.ENUM("on_track","watch","at_risk","high_risk", name="studentstatus", create_type=False), nullable=False),
+        sa.Column("intervention_required", sa.Boolean(), nullable=False),
+        sa.Column("student_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("as_of_date", "grade_level", "diploma_path", "student_status", "intervention_required"),
+    )
+
+    # Initial build (same query as `python -m app.manage rebuild-rollups`).
+    op.execute("""
+        INSERT INTO risk_rollups (as_of_date, grade_level, diploma_path, student_status, intervention_required, student_count)
+        SELECT m.as_of_date, s.grade_level, coalesce(s.diploma_path, ''), m.student_status, m.intervention_required, count(*)
+        FROM student_metrics m JOIN students s ON s.id = m.student_id
+        GROUP BY m.as_of_date, s.grade_level, coalesce(s.diploma_path, ''), m.student_status, m.intervention_required
+    """)
+
+def downgrade() -> None:
+    op.drop_table("risk_rollups")
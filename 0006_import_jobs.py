@@ -0,0 +1,39 @@
+"""import jobs
+
+Revision ID: 0006_import_jobs
+Revises: 0005_risk_rollups
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006_import_jobs"
+down_revision = "0005_risk_rollups"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("status", postgresql.ENUM("pending","running","completed","failed", name="jobstatus", create_type=False), nullable=False, server_default="pending"),
+        sa.Column("requested_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("spool_path", sa.String(length=1024), nullable=False),
+        sa.Column("total_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("counts", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors", sa.JSON(), nullable=False, server_default=sa.text("'[]'")),
+        sa.Column("rows_per_second", sa.Float(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+def downgrade() -> None:
+    op.drop_table("import_jobs")
@@ -0,0 +1,21 @@
+"""student_metrics input digest
+
+Revision ID: 0007_metric_input_digest
+Revises: 0006_import_jobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_metric_input_digest"
+down_revision = "0006_import_jobs"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing rows stay NULL and are treated as changed by their next import.
+    op.add_column("student_metrics", sa.Column("input_digest", sa.String(length=32), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column("student_metrics", "input_digest")
@@ -0,0 +1,90 @@
+"""partition student_metrics by school year
+
+Revision ID: 0008_partition_student_metrics
+Revises: 0007_metric_input_digest
+Create Date: 2026-10-18
+
+Rebuilds student_metrics as a table range-partitioned on as_of_date with one
+partition per school year (August to July) plus a DEFAULT partition. The
+primary key becomes (id, as_of_date) because Postgres requires the partition
+key in every unique constraint; uq_student_asof already includes it. Ids keep
+coming from the existing sequence. Rows are copied, so run it in a
+maintenance window on large tables.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_partition_student_metrics"
+down_revision = "0007_metric_input_digest"
+branch_labels = None
+depends_on = None
+
+# Kept in step with app.partitions; migrations do not import app code.
+SCHOOL_YEAR_START_MONTH = 8
+
+INDEXES = (
+    ("ix_student_metrics_student_id", "(student_id)"),
+    ("ix_student_metrics_as_of_date", "(as_of_date)"),
+    ("ix_student_metrics_student_id_as_of_date", "(student_id, as_of_date DESC)"),
+)
+
+def _school_year(d: date) -> int:
+    return d.year if d.month >= SCHOOL_YEAR_START_MONTH else d.year - 1
+
+def _drop_keys(table: str) -> None:
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS uq_student_asof")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS student_metrics_pkey")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS student_metrics_student_id_fkey")
+
+def _add_keys(primary_key: str) -> None:
+    op.execute(f"ALTER TABLE student_metrics ADD CONSTRAINT student_metrics_pkey PRIMARY KEY ({primary_key})")
+    op.execute("ALTER TABLE student_metrics ADD CONSTRAINT uq_student_asof UNIQUE (student_id, as_of_date)")
+    op.execute(
+        "ALTER TABLE student_metrics ADD CONSTRAINT student_metrics_student_id_fkey "
+        "FOREIGN KEY (student_id) REFERENCES students (id)"
+    )
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON student_metrics {columns}")
+
+def _move_rows(source: str) -> None:
+    op.execute("ALTER SEQUENCE student_metrics_id_seq OWNED BY NONE")
+    op.execute(f"INSERT INTO student_metrics SELECT * FROM {source}")
+    op.execute("ALTER SEQUENCE student_metrics_id_seq OWNED BY student_metrics.id")
+    op.execute(f"DROP TABLE {source}")
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE student_metrics RENAME TO student_metrics_unpartitioned")
+    _drop_keys("student_metrics_unpartitioned")
+    op.execute(
+        "CREATE TABLE student_metrics (LIKE student_metrics_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (as_of_date)"
+    )
+    _add_keys("id, as_of_date")
+    op.execute("CREATE TABLE student_metrics_default PARTITION OF student_metrics DEFAULT")
+
+    first, last = op.get_bind().execute(
+        sa.text("SELECT min(as_of_date), max(as_of_date) FROM student_metrics_unpartitioned")
+    ).one()
+    current = _school_year(date.today())
+    first_year = _school_year(first) if first else current
+    last_year = max(_school_year(last) if last else current, current) + 1
+    for year in range(first_year, last_year + 1):
+        start = date(year, SCHOOL_YEAR_START_MONTH, 1)
+        end = date(year + 1, SCHOOL_YEAR_START_MONTH, 1)
+        op.execute(
+            f"CREATE TABLE student_metrics_sy{year} PARTITION OF student_metrics "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    _move_rows("student_metrics_unpartitioned")
+
+def downgrade() -> None:
+    # Archived (dropped) school years are not brought back; restore them first.
+    op.execute("ALTER TABLE student_metrics RENAME TO student_metrics_partitioned")
+    _drop_keys("student_metrics_partitioned")
+    op.execute("CREATE TABLE student_metrics (LIKE student_metrics_partitioned INCLUDING DEFAULTS)")
+    _add_keys("id")
+    _move_rows("student_metrics_partitioned")
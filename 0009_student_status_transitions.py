@@ -0,0 +1,50 @@
+"""student status transitions
+
+Revision ID: 0009_student_status_transitions
+Revises: 0008_partition_student_metrics
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009_student_status_transitions"
+down_revision = "0008_partition_student_metrics"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    status = postgresql.ENUM("on_track","watch","at_risk","high_risk", name="studentstatus", create_type=False)
+    op.create_table(
+        "student_status_transitions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id"), nullable=False),
+        sa.Column("as_of_date", sa.Date(), nullable=False),
+        sa.Column("from_status", status, nullable=False),
+        sa.Column("to_status", status, nullable=False),
+        sa.Column("from_intervention", sa.Boolean(), nullable=False),
+        sa.Column("to_intervention", sa.Boolean(), nullable=False),
+        sa.UniqueConstraint("student_id", "as_of_date", name="uq_transition_student_asof"),
+    )
+    op.create_index("ix_student_status_transitions_as_of_date_id", "student_status_transitions", ["as_of_date", "id"])
+
+    # Initial build (same query as `python -m app.manage rebuild-transitions`).
+    op.execute("""
+        INSERT INTO student_status_transitions
+            (student_id, as_of_date, from_status, to_status, from_intervention, to_intervention)
+        SELECT student_id, as_of_date, from_status, student_status, from_intervention, intervention_required
+        FROM (
+            SELECT student_id, as_of_date, student_status, intervention_required,
+                   lag(student_status) OVER w AS from_status,
+                   lag(intervention_required) OVER w AS from_intervention
+            FROM student_metrics
+            WINDOW w AS (PARTITION BY student_id ORDER BY as_of_date)
+        ) m
+        WHERE from_status IS NOT NULL
+          AND (from_status <> student_status OR from_intervention <> intervention_required)
+    """)
+
+def downgrade() -> None:
+    op.drop_index("ix_student_status_transitions_as_of_date_id", table_name="student_status_transitions")
+    op.drop_table("student_status_transitions")
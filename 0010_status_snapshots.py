@@ -0,0 +1,41 @@
+"""materialized status snapshots
+
+Revision ID: 0010_status_snapshots
+Revises: 0009_student_status_transitions
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0010_status_snapshots"
+down_revision = "0009_student_status_transitions"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "status_snapshots",
+        sa.Column("snapshot_date", sa.Date(), primary_key=True),
+        sa.Column("student_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+    op.create_table(
+        "status_snapshot_rows",
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id"), nullable=False),
+        sa.Column("metric_id", sa.Integer(), nullable=False),
+        sa.Column("as_of_date", sa.Date(), nullable=False),
+        sa.Column("attendance_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("academic_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("graduation_risk_flag", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("risk_flag_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("student_status", postgresql.ENUM("on_track","watch","at_risk","high_risk", name="studentstatus", create_type=False), nullable=False, server_default="on_track"),
+        sa.Column("intervention_required", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.PrimaryKeyConstraint("snapshot_date", "student_id"),
+    )
+
+def downgrade() -> None:
+    op.drop_table("status_snapshot_rows")
+    op.drop_table("status_snapshots")
@@ -0,0 +1,20 @@
+"""students row version
+
+Revision ID: 0011_students_row_version
+Revises: 0010_status_snapshots
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_students_row_version"
+down_revision = "0010_status_snapshots"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("students", sa.Column("row_version", sa.Integer(), nullable=False, server_default="1"))
+
+def downgrade() -> None:
+    op.drop_column("students", "row_version")
@@ -0,0 +1,25 @@
+"""student_metrics updated_at
+
+Revision ID: 0012_metric_updated_at
+Revises: 0011_students_row_version
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_metric_updated_at"
+down_revision = "0011_students_row_version"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("student_metrics", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    # Rows never rewritten in place were last changed when they were created.
+    op.execute("UPDATE student_metrics SET updated_at = coalesce(created_at, now())")
+    op.alter_column("student_metrics", "updated_at", server_default=sa.func.now())
+    op.create_index("ix_student_metrics_updated_at", "student_metrics", ["updated_at"])
+
+def downgrade() -> None:
+    op.drop_index("ix_student_metrics_updated_at", table_name="student_metrics")
+    op.drop_column("student_metrics", "updated_at")
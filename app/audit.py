@@ -0,0 +1,135 @@
+"""
+Buffered audit log writer.
+
+crud.log_action puts events on an in-process queue; a background task
+writes them to audit_logs in multi-row inserts whenever batch_size events
+are waiting or flush_interval has passed. When the queue is full, callers
+wait up to enqueue_timeout (back-pressure) before the event is dropped and
+counted. The FastAPI lifespan starts the sink and drains it on shutdown.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models import AuditLog
+
+log = logging.getLogger(__name__)
+
+
+class AuditSink:
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float, enqueue_timeout: float):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-sink")
+
+    async def stop(self) -> None:
+        """Stop accepting events and write everything still queued."""
+        if not self.running:
+            return
+        await self._queue.put(None)  # sentinel: drain and exit
+        await self._task
+        self._task = None
+
+    async def emit(self, event: dict) -> bool:
+        event.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            log.warning("audit queue full (%s events); dropped %s", self._queue.qsize(), event.get("action"))
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+            await self._flush(batch)
+
+        # drain anything that raced in behind the sentinel
+        leftover = []
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is not None:
+                leftover.append(event)
+        for i in range(0, len(leftover), self.batch_size):
+            await self._flush(leftover[i:i + self.batch_size])
+
+    async def _flush(self, batch: list[dict]) -> None:
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(AuditLog), batch)
+                await db.commit()
+        except Exception:
+            self.dropped += len(batch)
+            log.exception("failed to write %s audit events", len(batch))
+            return
+        elapsed = time.perf_counter() - started
+        self.written += len(batch)
+        self.flushes += 1
+        self.flush_seconds_total += elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "avg_flush_ms": round(self.flush_seconds_total * 1000 / self.flushes, 3) if self.flushes else 0.0,
+            "max_flush_ms": round(self.flush_seconds_max * 1000, 3),
+        }
+
+
+audit_sink = AuditSink(
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    enqueue_timeout=settings.audit_enqueue_timeout_seconds,
+)
@@ -1,20 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import (
+    Date,
+    Integer,
+    String,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    desc,
+    extract,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array_agg, insert as pg_insert
+import hashlib
+import math
+from collections import Counter
 from datetime import date
+from enum import Enum
+import numpy as np
 from app import models, schemas
-from app.security import hash_password
-from app.rules import evaluate_rules, RuleInput
+from app.security import hash_password_async
+from app.deps import principal_cache
+from app.audit import audit_sink
+from app.rules import evaluate_rules, RuleInput, evaluate_rules_batch, growth_status_codes, GROWTH_STATUS_BY_CODE, STUDENT_STATUS_BY_CODE
 
 async def create_user(db: AsyncSession, data: schemas.UserCreate) -> models.User:
     user = models.User(
         email=data.email.lower().strip(),
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
         role=data.role,
         student_id=data.student_id,
     )
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    # Tokens carry the email, so a re-created account must not inherit cached principals.
+    principal_cache.invalidate_user(user.email)
     return user
 
 async def get_user_by_email(db: AsyncSession, email: str):
@@ -28,53 +59,851 @@ async def create_student(db: AsyncSession, data: schemas.StudentCreate) -> model
     await db.refresh(student)
     return student
 
+STUDENT_SYNC_COLUMNS = ("first_name", "last_name", "grade_level", "diploma_path")
+
+async def upsert_students(db: AsyncSession, rows: list[dict]) -> tuple[int, int, int]:
+    """
+    Upsert StudentCreate-shaped dicts with one
+    INSERT ... ON CONFLICT (local_student_id) DO UPDATE statement.
+    Rows whose synced columns are unchanged are left untouched.
+    Returns (created, updated, unchanged). The caller owns the transaction.
+    """
+    rows = list({r["local_student_id"]: r for r in rows}.values())
+    if not rows:
+        return 0, 0, 0
+    students = models.Student.__table__
+    local_ids = bindparam("local_ids", [r["local_student_id"] for r in rows], type_=ARRAY(String))
+    res = await db.execute(
+        select(students.c.local_student_id, students.c.grade_level, students.c.diploma_path)
+        .where(students.c.local_student_id == any_(local_ids))
+    )
+    existing = {local_id: (grade_level, diploma_path or "") for local_id, grade_level, diploma_path in res.all()}
+
+    stmt = pg_insert(students).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["local_student_id"],
+        set_={**{c: stmt.excluded[c] for c in STUDENT_SYNC_COLUMNS}, "row_version": students.c.row_version + 1},
+        where=or_(*(students.c[c].is_distinct_from(stmt.excluded[c]) for c in STUDENT_SYNC_COLUMNS)),
+    ).returning(students.c.local_student_id, students.c.id, students.c.grade_level, students.c.diploma_path)
+    res = await db.execute(stmt)
+    # Only inserted rows and rows that actually changed come back from RETURNING.
+    written = res.all()
+    created = sum(1 for r in written if r.local_student_id not in existing)
+    moved = {
+        r.id: existing[r.local_student_id]
+        for r in written
+        if r.local_student_id in existing and existing[r.local_student_id] != (r.grade_level, r.diploma_path or "")
+    }
+    await move_rollup_buckets(db, moved)
+    return created, len(written) - created, len(rows) - len(written)
+
+async def update_student(db: AsyncSession, student_id: int, changes: dict) -> models.Student | None:
+    """
+    Apply `changes` (STUDENT_SYNC_COLUMNS only) to one student and commit.
+    Like upsert_students, row_version is bumped only when a value actually
+    changes, and a grade_level or diploma_path change moves the student's
+    rollup buckets in the same transaction. None when the student does not exist.
+    """
+    students = models.Student.__table__
+    res = await db.execute(select(students).where(students.c.id == student_id).with_for_update())
+    current = res.one_or_none()
+    if current is None:
+        return None
+    changes = {c: v for c, v in changes.items() if c in STUDENT_SYNC_COLUMNS and getattr(current, c) != v}
+    if changes:
+        await db.execute(
+            update(students)
+            .where(students.c.id == student_id)
+            .values(**changes, row_version=students.c.row_version + 1)
+        )
+        previous = (current.grade_level, current.diploma_path or "")
+        if (changes.get("grade_level", current.grade_level), changes.get("diploma_path", current.diploma_path) or "") != previous:
+            await move_rollup_buckets(db, {student_id: previous})
+    await db.commit()
+    res = await db.execute(
+        select(models.Student).where(models.Student.id == student_id).execution_options(populate_existing=True)
+    )
+    return res.scalar_one()
+
+STUDENT_ORDER = (models.Student.last_name, models.Student.first_name, models.Student.id)
+
+def student_sort_key(student: models.Student) -> tuple:
+    return (student.last_name, student.first_name, student.id)
+
 async def list_students(db: AsyncSession, limit: int = 100, offset: int = 0):
-    res = await db.execute(select(models.Student).order_by(models.Student.last_name, models.Student.first_name).limit(limit).offset(offset))
+    res = await db.execute(select(models.Student).order_by(*STUDENT_ORDER).limit(limit).offset(offset))
     return res.scalars().all()
 
+async def list_students_after(db: AsyncSession, limit: int = 100, after: tuple | None = None):
+    """
+    Keyset page in (last_name, first_name, id) order, served by ix_students_name_id.
+    Returns (students, next_key); next_key is None on the last page.
+    """
+    stmt = select(models.Student).order_by(*STUDENT_ORDER).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(tuple_(*STUDENT_ORDER) > tuple_(*after))
+    res = await db.execute(stmt)
+    students = res.scalars().all()
+    if len(students) <= limit:
+        return students, None
+    students = students[:limit]
+    return students, student_sort_key(students[-1])
+
+async def list_roster(
+    db: AsyncSession,
+    limit: int = 100,
+    offset: int = 0,
+    after: tuple | None = None,
+    student_status: models.StudentStatus | None = None,
+    grade_level: int | None = None,
+    diploma_path: str | None = None,
+    intervention_required: bool | None = None,
+):
+    """
+    Students with their latest metric in one statement (students -> projection -> metric).
+    Returns ([(student, latest_metric_or_None)], next_key) like list_students_after.
+    """
+    projection = models.StudentCurrentStatus
+    stmt = (
+        select(models.Student, models.StudentMetric)
+        .outerjoin(projection, projection.student_id == models.Student.id)
+        # as_of_date lets Postgres prune to one student_metrics partition
+        .outerjoin(
+            models.StudentMetric,
+            (models.StudentMetric.id == projection.metric_id) & (models.StudentMetric.as_of_date == projection.as_of_date),
+        )
+        .order_by(*STUDENT_ORDER)
+        .limit(limit + 1)
+    )
+    if student_status is not None:
+        stmt = stmt.where(projection.student_status == student_status)
+    if intervention_required is not None:
+        stmt = stmt.where(projection.intervention_required == intervention_required)
+    if grade_level is not None:
+        stmt = stmt.where(models.Student.grade_level == grade_level)
+    if diploma_path is not None:
+        stmt = stmt.where(models.Student.diploma_path == diploma_path)
+    if after is not None:
+        stmt = stmt.where(tuple_(*STUDENT_ORDER) > tuple_(*after))
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    res = await db.execute(stmt)
+    rows = [tuple(r) for r in res.all()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, student_sort_key(rows[-1][0])
+
+async def student_version(db: AsyncSession, student_id: int):
+    """
+    The values a student's detail response depends on, without loading it:
+    (row_version, latest metric id, its created_at, projection updated_at),
+    or None when the student does not exist. Index lookups only.
+    """
+    projection = models.StudentCurrentStatus
+    metric = models.StudentMetric
+    res = await db.execute(
+        select(models.Student.row_version, projection.metric_id, metric.created_at, projection.updated_at)
+        .outerjoin(projection, projection.student_id == models.Student.id)
+        .outerjoin(metric, (metric.id == projection.metric_id) & (metric.as_of_date == projection.as_of_date))
+        .where(models.Student.id == student_id)
+    )
+    return res.one_or_none()
+
 async def get_student(db: AsyncSession, student_id: int):
     res = await db.execute(select(models.Student).where(models.Student.id == student_id))
     return res.scalar_one_or_none()
 
-async def add_metric(db: AsyncSession, student_id: int, data: schemas.MetricIn) -> models.StudentMetric:
-    inp = RuleInput(
-        attendance_percentage=data.attendance_percentage,
-        growth_status=data.growth_status,
-        credits_earned=data.credits_earned,
-        expected_credits_for_grade=data.expected_credits_for_grade,
+METRIC_INPUT_COLUMNS = ("attendance_percentage", "growth_status", "credits_earned", "expected_credits_for_grade")
+METRIC_RESULT_COLUMNS = (
+    "attendance_risk_flag",
+    "academic_risk_flag",
+    "graduation_risk_flag",
+    "risk_flag_count",
+    "student_status",
+    "intervention_required",
+)
+
+def _number(value, cast=float):
+    """None for a missing value (None or NaN), else value as `cast`."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return cast(value)
+
+def metric_input_values(inputs) -> tuple:
+    """
+    Input column values (METRIC_INPUT_COLUMNS order) as they are stored and
+    digested: NaN and None both mean "no data", attendance is a float and
+    credits are ints. Every write path goes through this, so the same row
+    digests the same whether it came from a CSV, a batch or a column batch.
+    """
+    attendance, growth_status, credits_earned, expected_credits = inputs
+    return _number(attendance), growth_status, _number(credits_earned, int), _number(expected_credits, int)
+
+def metric_digest(inputs) -> str:
+    """
+    Fingerprint of a row's input columns (values in METRIC_INPUT_COLUMNS order),
+    stored as student_metrics.input_digest so re-imports can skip unchanged rows.
+    """
+    canonical = "|".join(
+        "" if v is None else v.value if isinstance(v, Enum) else repr(v)
+        for v in metric_input_values(inputs)
     )
-    out = evaluate_rules(inp)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
 
-    metric = models.StudentMetric(
-        student_id=student_id,
-        as_of_date=data.as_of_date,
+def metric_values(student_id: int, data: schemas.MetricIn) -> dict:
+    """Column values for one student_metrics row, including the computed rule outputs."""
+    out = evaluate_rules(RuleInput(
         attendance_percentage=data.attendance_percentage,
         growth_status=data.growth_status,
         credits_earned=data.credits_earned,
         expected_credits_for_grade=data.expected_credits_for_grade,
-        attendance_risk_flag=out.attendance_risk_flag,
-        academic_risk_flag=out.academic_risk_flag,
-        graduation_risk_flag=out.graduation_risk_flag,
-        risk_flag_count=out.risk_flag_count,
-        student_status=out.student_status,
-        intervention_required=out.intervention_required,
+    ))
+    values = {"student_id": student_id, "as_of_date": data.as_of_date}
+    values.update(zip(METRIC_INPUT_COLUMNS, metric_input_values(getattr(data, c) for c in METRIC_INPUT_COLUMNS)))
+    values.update({c: getattr(out, c) for c in METRIC_RESULT_COLUMNS})
+    values["input_digest"] = metric_digest(values[c] for c in METRIC_INPUT_COLUMNS)
+    return values
+
+def metric_rows(student_ids: list[int], payloads: list[schemas.MetricIn]) -> list[dict]:
+    """metric_values for many rows, with the rules evaluated column-wise."""
+    return metric_column_rows(
+        student_ids,
+        [p.as_of_date for p in payloads],
+        np.array([p.attendance_percentage for p in payloads], dtype=np.float64),
+        growth_status_codes([p.growth_status for p in payloads]),
+        np.array([p.credits_earned for p in payloads], dtype=np.float64),
+        np.array([p.expected_credits_for_grade for p in payloads], dtype=np.float64),
     )
+
+def metric_column_rows(
+    student_ids: list[int],
+    as_of_dates: list[date],
+    attendance: np.ndarray,
+    growth_codes: np.ndarray,
+    credits_earned: np.ndarray,
+    expected_credits: np.ndarray,
+) -> list[dict]:
+    """
+    metric_rows for column input as produced by app.csv_parallel:
+    float64 columns with NaN for missing values and GROWTH_STATUS_CODES.
+    """
+    out = evaluate_rules_batch(attendance, growth_codes, credits_earned, expected_credits)
+    # tolist() hands the driver plain Python bools/ints rather than NumPy scalars.
+    inputs = zip(
+        attendance.tolist(),
+        [GROWTH_STATUS_BY_CODE[code] for code in growth_codes.tolist()],
+        credits_earned.tolist(),
+        expected_credits.tolist(),
+    )
+    columns = {c: getattr(out, c).tolist() for c in METRIC_RESULT_COLUMNS}
+    columns["student_status"] = [STUDENT_STATUS_BY_CODE[code] for code in columns["student_status"]]
+    rows = []
+    for i, (student_id, as_of_date, row_inputs) in enumerate(zip(student_ids, as_of_dates, inputs)):
+        values = {"student_id": student_id, "as_of_date": as_of_date}
+        values.update(zip(METRIC_INPUT_COLUMNS, metric_input_values(row_inputs)))
+        values.update({c: columns[c][i] for c in METRIC_RESULT_COLUMNS})
+        values["input_digest"] = metric_digest(values[c] for c in METRIC_INPUT_COLUMNS)
+        rows.append(values)
+    return rows
+
+async def add_metric(db: AsyncSession, student_id: int, data: schemas.MetricIn) -> models.StudentMetric:
+    values = metric_values(student_id, data)
+    metric = models.StudentMetric(**values)
     db.add(metric)
+    await db.flush()
+    await refresh_current_status(db, [{**values, "id": metric.id}])
+    await apply_rollup_deltas(db, removed=[], added=[values])
+    await record_transitions(db, [(student_id, data.as_of_date)])
+    await invalidate_snapshots(db, data.as_of_date)
     await db.commit()
     await db.refresh(metric)
     return metric
 
+async def existing_student_ids(db: AsyncSession, student_ids) -> set[int]:
+    """The subset of student_ids that exist, in one round trip."""
+    ids = bindparam("student_ids", list(student_ids), type_=ARRAY(Integer))
+    res = await db.execute(select(models.Student.id).where(models.Student.id == any_(ids)))
+    return set(res.scalars().all())
+
+async def student_ids_by_local_id(db: AsyncSession, local_ids) -> dict[str, int]:
+    """Resolve many local_student_ids in one round trip (a single array parameter, not an IN list)."""
+    ids = bindparam("local_ids", list(local_ids), type_=ARRAY(String))
+    res = await db.execute(
+        select(models.Student.local_student_id, models.Student.id)
+        .where(models.Student.local_student_id == any_(ids))
+    )
+    return {local_id: student_id for local_id, student_id in res.all()}
+
+async def metric_digests(db: AsyncSession, keys) -> dict[tuple[int, date], str | None]:
+    """Stored input_digest for each existing (student_id, as_of_date) key, in one round trip."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    metrics = models.StudentMetric
+    res = await db.execute(
+        select(metrics.student_id, metrics.as_of_date, metrics.input_digest)
+        .where(tuple_(metrics.student_id, metrics.as_of_date).in_(keys))
+    )
+    return {(student_id, as_of_date): digest for student_id, as_of_date, digest in res.all()}
+
+async def upsert_metrics(db: AsyncSession, rows: list[dict]) -> tuple[int, int]:
+    """
+    Write metric rows (as built by metric_values) with one multi-row
+    INSERT ... ON CONFLICT (student_id, as_of_date) DO UPDATE against uq_student_asof.
+    Returns (created, updated). The caller owns the transaction.
+    """
+    created, updated = await upsert_metric_keys(db, rows)
+    return len(created), len(updated)
+
+async def upsert_metric_keys(db: AsyncSession, rows: list[dict]) -> tuple[set, set]:
+    """upsert_metrics, returning the (student_id, as_of_date) keys it created and updated."""
+    # Postgres refuses to touch the same row twice in one statement; last row wins.
+    rows = list({(r["student_id"], r["as_of_date"]): r for r in rows}.values())
+    if not rows:
+        return set(), set()
+    keys = [(r["student_id"], r["as_of_date"]) for r in rows]
+    res = await db.execute(
+        select(
+            models.StudentMetric.student_id,
+            models.StudentMetric.as_of_date,
+            models.StudentMetric.student_status,
+            models.StudentMetric.intervention_required,
+        )
+        .where(tuple_(models.StudentMetric.student_id, models.StudentMetric.as_of_date).in_(keys))
+    )
+    existing = {(r.student_id, r.as_of_date): r._asdict() for r in res.all()}
+
+    metrics = models.StudentMetric.__table__
+    stmt = pg_insert(metrics).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id", "as_of_date"],
+        set_={
+            **{c: stmt.excluded[c] for c in METRIC_INPUT_COLUMNS + METRIC_RESULT_COLUMNS + ("input_digest",)},
+            "updated_at": func.now(),
+        },
+    ).returning(metrics.c.id, metrics.c.student_id, metrics.c.as_of_date)
+    res = await db.execute(stmt)
+    ids = {(student_id, as_of_date): metric_id for metric_id, student_id, as_of_date in res.all()}
+    await refresh_current_status(db, [{**r, "id": ids[k]} for k, r in zip(keys, rows)])
+    await apply_rollup_deltas(db, removed=list(existing.values()), added=rows)
+    await record_transitions(db, [
+        k for k, r in zip(keys, rows)
+        if k not in existing or transition_state(existing[k]) != transition_state(r)
+    ])
+    await invalidate_snapshots(db, min(as_of_date for _, as_of_date in keys))
+
+    return {k for k in keys if k not in existing}, {k for k in keys if k in existing}
+
+CURRENT_STATUS_COLUMNS = ("as_of_date",) + METRIC_RESULT_COLUMNS
+
+async def refresh_current_status(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Point student_current_status at the newest of the given metric rows
+    (metric_values dicts plus "id"), unless a newer metric is already recorded.
+    Call it in the same transaction as the metric write.
+    """
+    latest: dict[int, dict] = {}
+    for r in rows:
+        current = latest.get(r["student_id"])
+        if current is None or r["as_of_date"] >= current["as_of_date"]:
+            latest[r["student_id"]] = r
+    if not latest:
+        return
+
+    projection = models.StudentCurrentStatus.__table__
+    stmt = pg_insert(projection).values([
+        {"student_id": r["student_id"], "metric_id": r["id"], **{c: r[c] for c in CURRENT_STATUS_COLUMNS}}
+        for r in latest.values()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id"],
+        set_={
+            "metric_id": stmt.excluded.metric_id,
+            **{c: stmt.excluded[c] for c in CURRENT_STATUS_COLUMNS},
+            "updated_at": func.now(),
+        },
+        # a backdated metric must not replace a newer one
+        where=projection.c.as_of_date <= stmt.excluded.as_of_date,
+    )
+    await db.execute(stmt)
+
+async def sync_current_status(db: AsyncSession, metric_ids: list[int]) -> None:
+    """Copy re-scored outputs of the given metrics into any projection rows that point at them."""
+    if not metric_ids:
+        return
+    projection = models.StudentCurrentStatus
+    metric = models.StudentMetric
+    await db.execute(
+        update(projection)
+        .where(projection.metric_id == metric.id)
+        .where(metric.id == any_(bindparam("metric_ids", list(metric_ids), type_=ARRAY(Integer))))
+        .values({c: getattr(metric, c) for c in METRIC_RESULT_COLUMNS})
+        .values(updated_at=func.now())
+    )
+
+def _latest_metrics():
+    """Each student's newest metric, as projection columns."""
+    metric = models.StudentMetric
+    return (
+        select(metric.student_id, metric.id, *(getattr(metric, c) for c in CURRENT_STATUS_COLUMNS))
+        .distinct(metric.student_id)
+        .order_by(metric.student_id, desc(metric.as_of_date))
+    )
+
+CURRENT_STATUS_INSERT_COLUMNS = ("student_id", "metric_id") + CURRENT_STATUS_COLUMNS
+
+async def rebuild_current_status(db: AsyncSession) -> int:
+    """Recompute the whole projection from student_metrics. Returns the number of students."""
+    await db.execute(delete(models.StudentCurrentStatus))
+    await db.execute(insert(models.StudentCurrentStatus).from_select(CURRENT_STATUS_INSERT_COLUMNS, _latest_metrics()))
+    res = await db.execute(select(func.count()).select_from(models.StudentCurrentStatus))
+    return res.scalar_one()
+
+async def repoint_current_status(db: AsyncSession, start: date, end: date) -> int:
+    """
+    After metrics dated [start, end] were removed or restored in bulk (partition
+    archive/restore), recompute the projection of every student with a projection
+    row or a metric in that range: it points at their newest remaining metric, or
+    is removed when they have none. Returns the number of students recomputed.
+    """
+    projection, metric = models.StudentCurrentStatus, models.StudentMetric
+    affected = union_all(
+        select(projection.student_id).where(projection.as_of_date.between(start, end)),
+        select(metric.student_id).where(metric.as_of_date.between(start, end)),
+    ).subquery()
+    res = await db.execute(select(affected.c.student_id).distinct())
+    student_ids = res.scalars().all()
+    if not student_ids:
+        return 0
+    ids = bindparam("student_ids", list(student_ids), type_=ARRAY(Integer))
+    await db.execute(delete(projection).where(projection.student_id == any_(ids)))
+    await db.execute(
+        insert(projection).from_select(CURRENT_STATUS_INSERT_COLUMNS, _latest_metrics().where(metric.student_id == any_(ids)))
+    )
+    return len(student_ids)
+
+ROLLUP_KEY = ("as_of_date", "grade_level", "diploma_path", "student_status", "intervention_required")
+
+async def apply_rollup_deltas(db: AsyncSession, removed: list[dict], added: list[dict]) -> None:
+    """
+    Move metrics between risk_rollups buckets. Each dict needs student_id, as_of_date,
+    student_status and intervention_required; grade_level and diploma_path are the
+    student's current values. Call it in the same transaction as the metric write.
+    """
+    student_ids = {m["student_id"] for m in removed} | {m["student_id"] for m in added}
+    if not student_ids:
+        return
+    # FOR SHARE waits out a concurrent upsert_students that is moving these
+    # students to other buckets, then reads the dims it committed.
+    res = await db.execute(
+        select(models.Student.id, models.Student.grade_level, models.Student.diploma_path)
+        .where(models.Student.id == any_(bindparam("student_ids", list(student_ids), type_=ARRAY(Integer))))
+        .order_by(models.Student.id)
+        .with_for_update(read=True)
+    )
+    dims = {student_id: (grade_level, diploma_path or "") for student_id, grade_level, diploma_path in res.all()}
+
+    deltas: Counter = Counter()
+    for sign, metrics in ((-1, removed), (1, added)):
+        for m in metrics:
+            grade_level, diploma_path = dims[m["student_id"]]
+            key = (m["as_of_date"], grade_level, diploma_path, models.StudentStatus(m["student_status"]), m["intervention_required"])
+            deltas[key] += sign
+    # Sorted so concurrent writers lock buckets in the same order.
+    values = [
+        {**dict(zip(ROLLUP_KEY, key)), "student_count": n}
+        for key, n in sorted(deltas.items(), key=lambda kv: tuple(str(k) for k in kv[0]))
+        if n
+    ]
+    if not values:
+        return
+    rollups = models.RiskRollup.__table__
+    stmt = pg_insert(rollups).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={"student_count": rollups.c.student_count + stmt.excluded.student_count},
+    )
+    await db.execute(stmt)
+
+async def move_rollup_buckets(db: AsyncSession, previous: dict[int, tuple[int, str]]) -> None:
+    """
+    After students' grade_level or diploma_path changed, move all their metrics
+    from the buckets of the previous (grade_level, diploma_path or "") given per
+    student id to the buckets of the current values, in one statement.
+    Call it in the same transaction as the student update.
+    """
+    if not previous:
+        return
+    metric, student = models.StudentMetric, models.Student
+    moved = select(
+        values(column("student_id", Integer), column("grade_level", Integer), column("diploma_path", String), name="previous")
+        .data([(student_id, grade_level, diploma_path) for student_id, (grade_level, diploma_path) in sorted(previous.items())])
+    ).cte("moved")
+    bucket = (metric.as_of_date, metric.student_status, metric.intervention_required)
+    out_of = (
+        select(*bucket, moved.c.grade_level, moved.c.diploma_path, literal_column("-1").label("delta"))
+        .join(moved, moved.c.student_id == metric.student_id)
+    )
+    into = (
+        select(*bucket, student.grade_level, func.coalesce(student.diploma_path, literal_column("''")), literal_column("1"))
+        .join(moved, moved.c.student_id == metric.student_id)
+        .join(student, student.id == metric.student_id)
+    )
+    deltas = union_all(out_of, into).subquery()
+    key = [deltas.c[c] for c in ROLLUP_KEY]
+    total = func.sum(deltas.c.delta)
+    rollups = models.RiskRollup.__table__
+    stmt = pg_insert(rollups).from_select(
+        list(ROLLUP_KEY) + ["student_count"],
+        # Ordered so concurrent writers lock buckets in a consistent order.
+        select(*key, cast(total, Integer)).group_by(*key).having(total != 0).order_by(*key),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={"student_count": rollups.c.student_count + stmt.excluded.student_count},
+    )
+    await db.execute(stmt)
+
+def _live_rollup_query():
+    metric = models.StudentMetric
+    student = models.Student
+    # literal, not a bind parameter, so GROUP BY matches the selected expression
+    diploma_path = func.coalesce(student.diploma_path, literal_column("''"))
+    return (
+        select(
+            metric.as_of_date,
+            student.grade_level,
+            diploma_path,
+            metric.student_status,
+            metric.intervention_required,
+            func.count(),
+        )
+        .join(student, student.id == metric.student_id)
+        .group_by(metric.as_of_date, student.grade_level, diploma_path, metric.student_status, metric.intervention_required)
+    )
+
+async def rebuild_risk_rollups(db: AsyncSession, start: date | None = None, end: date | None = None) -> int:
+    """
+    Recompute risk_rollups from student_metrics, optionally only for
+    as_of_date in [start, end]. Returns the number of buckets in that range.
+    """
+    rollup, metric = models.RiskRollup, models.StudentMetric
+    live, in_range = _live_rollup_query(), []
+    if start is not None:
+        live = live.where(metric.as_of_date >= start)
+        in_range.append(rollup.as_of_date >= start)
+    if end is not None:
+        live = live.where(metric.as_of_date <= end)
+        in_range.append(rollup.as_of_date <= end)
+    await db.execute(delete(rollup).where(*in_range))
+    await db.execute(insert(rollup).from_select(list(ROLLUP_KEY) + ["student_count"], live))
+    res = await db.execute(select(func.count()).select_from(rollup).where(*in_range))
+    return res.scalar_one()
+
+async def risk_rollup_drift(db: AsyncSession) -> list[dict]:
+    """Buckets where risk_rollups disagrees with a live GROUP BY over student_metrics."""
+    live = {tuple(r[:-1]): r[-1] for r in (await db.execute(_live_rollup_query())).all()}
+    res = await db.execute(
+        select(*(getattr(models.RiskRollup, c) for c in ROLLUP_KEY), models.RiskRollup.student_count)
+        .where(models.RiskRollup.student_count != 0)
+    )
+    stored = {tuple(r[:-1]): r[-1] for r in res.all()}
+    return [
+        {**dict(zip(ROLLUP_KEY, key)), "rollup_count": stored.get(key, 0), "live_count": live.get(key, 0)}
+        for key in sorted(live.keys() | stored.keys(), key=lambda k: tuple(str(v) for v in k))
+        if stored.get(key, 0) != live.get(key, 0)
+    ]
+
+async def risk_rollups(
+    db: AsyncSession,
+    as_of_date: date | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    grade_level: int | None = None,
+    diploma_path: str | None = None,
+):
+    rollup = models.RiskRollup
+    # != 0 rather than > 0 so a bucket driven negative by drift shows up instead of vanishing.
+    stmt = select(rollup).where(rollup.student_count != 0).order_by(*(getattr(rollup, c) for c in ROLLUP_KEY))
+    if as_of_date is not None:
+        stmt = stmt.where(rollup.as_of_date == as_of_date)
+    if start is not None:
+        stmt = stmt.where(rollup.as_of_date >= start)
+    if end is not None:
+        stmt = stmt.where(rollup.as_of_date <= end)
+    if grade_level is not None:
+        stmt = stmt.where(rollup.grade_level == grade_level)
+    if diploma_path is not None:
+        stmt = stmt.where(rollup.diploma_path == diploma_path)
+    res = await db.execute(stmt)
+    return res.scalars().all()
+
+async def invalidate_snapshots(db: AsyncSession, since: date | None) -> None:
+    """
+    Drop materialized snapshots that a metric write dated `since` can change
+    (snapshot_date >= since). Weekly writes are newer than any closed snapshot,
+    so this usually deletes nothing.
+    """
+    if since is None:
+        return
+    await db.execute(delete(models.StatusSnapshotRow).where(models.StatusSnapshotRow.snapshot_date >= since))
+    await db.execute(delete(models.StatusSnapshot).where(models.StatusSnapshot.snapshot_date >= since))
+
+TRANSITION_COLUMNS = ("student_status", "intervention_required")
+
+def transition_state(row) -> tuple:
+    """(student_status, intervention_required) of a metric row, dict or Row."""
+    if isinstance(row, dict):
+        return tuple(row[c] for c in TRANSITION_COLUMNS)
+    return tuple(getattr(row, c) for c in TRANSITION_COLUMNS)
+
+async def record_transitions(db: AsyncSession, keys) -> None:
+    """
+    Re-derive student_status_transitions after the metrics at `keys`
+    ((student_id, as_of_date) pairs) were written with a new status or
+    intervention flag: each key is compared with the student's previous
+    metric, and the next metric after it with the key, so backdated writes
+    fix up their successor too. Call it after the write, in the same transaction.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    metric = models.StudentMetric
+    written = values(column("student_id", Integer), column("as_of_date", Date), name="written").data(keys)
+    previous_date = (
+        select(func.max(metric.as_of_date))
+        .where(metric.student_id == written.c.student_id, metric.as_of_date < written.c.as_of_date)
+        .scalar_subquery()
+    )
+    next_date = (
+        select(func.min(metric.as_of_date))
+        .where(metric.student_id == written.c.student_id, metric.as_of_date > written.c.as_of_date)
+        .scalar_subquery()
+    )
+    res = await db.execute(select(written.c.student_id, written.c.as_of_date, previous_date, next_date))
+    predecessor = {}  # metric key -> the key of the metric before it
+    for student_id, as_of_date, before, after in res.all():
+        predecessor[(student_id, as_of_date)] = (student_id, before) if before else None
+        if after:
+            predecessor[(student_id, after)] = (student_id, as_of_date)
+
+    needed = set(predecessor) | {k for k in predecessor.values() if k}
+    res = await db.execute(
+        select(metric.student_id, metric.as_of_date, *(getattr(metric, c) for c in TRANSITION_COLUMNS))
+        .where(tuple_(metric.student_id, metric.as_of_date).in_(needed))
+    )
+    state = {(r.student_id, r.as_of_date): transition_state(r) for r in res.all()}
+
+    transitions = models.StudentStatusTransition
+    await db.execute(delete(transitions).where(tuple_(transitions.student_id, transitions.as_of_date).in_(list(predecessor))))
+    added = [
+        {
+            "student_id": key[0],
+            "as_of_date": key[1],
+            "from_status": state[before][0],
+            "to_status": state[key][0],
+            "from_intervention": state[before][1],
+            "to_intervention": state[key][1],
+        }
+        for key, before in sorted(predecessor.items())
+        if before and state[before] != state[key]
+    ]
+    if added:
+        await db.execute(insert(transitions), added)
+
+async def rebuild_status_transitions(db: AsyncSession) -> int:
+    """Recompute student_status_transitions from student_metrics. Returns the number of transitions."""
+    metric = models.StudentMetric
+    window = {"partition_by": metric.student_id, "order_by": metric.as_of_date}
+    ordered = select(
+        metric.student_id,
+        metric.as_of_date,
+        func.lag(metric.student_status).over(**window).label("from_status"),
+        metric.student_status.label("to_status"),
+        func.lag(metric.intervention_required).over(**window).label("from_intervention"),
+        metric.intervention_required.label("to_intervention"),
+    ).subquery()
+    changes = select(ordered).where(
+        ordered.c.from_status.is_not(None),
+        or_(ordered.c.from_status != ordered.c.to_status, ordered.c.from_intervention != ordered.c.to_intervention),
+    )
+    transitions = models.StudentStatusTransition
+    await db.execute(delete(transitions))
+    await db.execute(insert(transitions).from_select(list(ordered.c.keys()), changes))
+    res = await db.execute(select(func.count()).select_from(transitions))
+    return res.scalar_one()
+
+async def list_transitions(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    limit: int = 100,
+    after: tuple | None = None,
+    from_status: models.StudentStatus | None = None,
+    to_status: models.StudentStatus | None = None,
+    to_intervention: bool | None = None,
+    grade_level: int | None = None,
+    diploma_path: str | None = None,
+):
+    """
+    Transitions with as_of_date in [start, end], keyset-paged in (as_of_date, id)
+    order over ix_student_status_transitions_as_of_date_id. Never reads student_metrics.
+    Returns ([(transition, student)], next_key); next_key is None on the last page.
+    """
+    transitions = models.StudentStatusTransition
+    order = (transitions.as_of_date, transitions.id)
+    stmt = (
+        select(transitions, models.Student)
+        .join(models.Student, models.Student.id == transitions.student_id)
+        .where(transitions.as_of_date >= start, transitions.as_of_date <= end)
+        .order_by(*order)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(*order) > tuple_(*after))
+    if from_status is not None:
+        stmt = stmt.where(transitions.from_status == from_status)
+    if to_status is not None:
+        stmt = stmt.where(transitions.to_status == to_status)
+    if to_intervention is not None:
+        stmt = stmt.where(transitions.to_intervention == to_intervention)
+    if grade_level is not None:
+        stmt = stmt.where(models.Student.grade_level == grade_level)
+    if diploma_path is not None:
+        stmt = stmt.where(models.Student.diploma_path == diploma_path)
+    res = await db.execute(stmt)
+    rows = res.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1][0]
+    return rows, (last.as_of_date, last.id)
+
 async def latest_metric_for_student(db: AsyncSession, student_id: int):
+    # One primary-key hop through the projection instead of sorting the student's history.
     res = await db.execute(
         select(models.StudentMetric)
-        .where(models.StudentMetric.student_id == student_id)
-        .order_by(desc(models.StudentMetric.as_of_date))
-        .limit(1)
+        .join(
+            models.StudentCurrentStatus,
+            (models.StudentCurrentStatus.metric_id == models.StudentMetric.id)
+            & (models.StudentCurrentStatus.as_of_date == models.StudentMetric.as_of_date),
+        )
+        .where(models.StudentCurrentStatus.student_id == student_id)
     )
     return res.scalar_one_or_none()
 
+# Terms are semesters: fall starts in August, spring in January.
+FALL_TERM_START_MONTH = 8
+
+def _history_bucket(as_of_date, bucket: str):
+    if bucket == "term":
+        year = cast(extract("year", as_of_date), Integer)
+        month = case((extract("month", as_of_date) >= FALL_TERM_START_MONTH, FALL_TERM_START_MONTH), else_=1)
+        return func.make_date(year, month, 1)
+    return cast(func.date_trunc(bucket, as_of_date), Date)
+
+async def metric_history(
+    db: AsyncSession,
+    student_id: int,
+    bucket: str = "month",
+    start: date | None = None,
+    end: date | None = None,
+) -> list[dict]:
+    """
+    A student's metrics downsampled to one point per week/month/term, in date order.
+    One range scan of (student_id, as_of_date); lag() counts status changes inside it.
+    """
+    metric = models.StudentMetric
+    inner = select(
+        metric.as_of_date,
+        metric.attendance_percentage,
+        metric.credits_earned,
+        metric.expected_credits_for_grade,
+        metric.student_status,
+        metric.intervention_required,
+        func.lag(metric.student_status).over(order_by=metric.as_of_date).label("previous_status"),
+    ).where(metric.student_id == student_id)
+    if start is not None:
+        inner = inner.where(metric.as_of_date >= start)
+    if end is not None:
+        inner = inner.where(metric.as_of_date <= end)
+    m = inner.subquery()
+
+    def first(col):
+        return array_agg(aggregate_order_by(col, m.c.as_of_date))[1]
+
+    def last(col):
+        return array_agg(aggregate_order_by(col, m.c.as_of_date.desc()))[1]
+
+    bucket_start = _history_bucket(m.c.as_of_date, bucket).label("bucket_start")
+    stmt = (
+        select(
+            bucket_start,
+            func.count().label("points"),
+            func.min(m.c.as_of_date).label("first_date"),
+            func.max(m.c.as_of_date).label("last_date"),
+            first(m.c.attendance_percentage).label("first_attendance"),
+            last(m.c.attendance_percentage).label("last_attendance"),
+            func.avg(m.c.attendance_percentage).label("avg_attendance"),
+            last(m.c.credits_earned).label("credits_earned"),
+            last(m.c.expected_credits_for_grade).label("expected_credits_for_grade"),
+            last(m.c.student_status).label("student_status"),
+            last(m.c.intervention_required).label("intervention_required"),
+            func.count()
+            .filter(m.c.previous_status.is_not(None), m.c.previous_status != m.c.student_status)
+            .label("status_transitions"),
+        )
+        .group_by(bucket_start)
+        .order_by(bucket_start)
+    )
+    res = await db.execute(stmt)
+    points = []
+    for r in res.all():
+        point = r._asdict()
+        point["avg_attendance"] = float(point["avg_attendance"]) if point["avg_attendance"] is not None else None
+        point["credit_pace"] = (
+            point["credits_earned"] / point["expected_credits_for_grade"]
+            if point["credits_earned"] is not None and point["expected_credits_for_grade"]
+            else None
+        )
+        points.append(point)
+    return points
+
+def history_trends(points: list[dict]) -> dict:
+    """Deltas across a downsampled history: attendance slope (least squares, points per week) and status movement."""
+    samples = [
+        ((p["last_date"] - points[0]["last_date"]).days / 7, p["avg_attendance"])
+        for p in points
+        if p["avg_attendance"] is not None
+    ]
+    slope = None
+    if len(samples) >= 2:
+        mean_x = sum(x for x, _ in samples) / len(samples)
+        mean_y = sum(y for _, y in samples) / len(samples)
+        var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+        if var_x:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x
+    return {
+        "attendance_slope_per_week": round(slope, 4) if slope is not None else None,
+        "attendance_change": (
+            points[-1]["last_attendance"] - points[0]["first_attendance"]
+            if points and points[-1]["last_attendance"] is not None and points[0]["first_attendance"] is not None
+            else None
+        ),
+        "status_transitions": sum(p["status_transitions"] for p in points),
+        "first_status": points[0]["student_status"] if points else None,
+        "latest_status": points[-1]["student_status"] if points else None,
+    }
+
 async def log_action(db: AsyncSession, actor_user_id: int | None, action: str, target_type: str | None = None, target_id: str | None = None):
-    db.add(models.AuditLog(actor_user_id=actor_user_id, action=action, target_type=target_type, target_id=target_id))
+    event = {"actor_user_id": actor_user_id, "action": action, "target_type": target_type, "target_id": target_id}
+    if audit_sink.running:
+        await audit_sink.emit(event)
+        return
+    # No sink outside the app lifespan (scripts, one-off sessions): write inline.
+    db.add(models.AuditLog(**event))
     await db.commit()
 
 
@@ -85,14 +914,14 @@ async def authenticate_user(db, email: str, password: str):
     """
     from sqlalchemy import select
     from app.models import User
-    from app.security import verify_password
+    from app.security import verify_password_async
 
     res = await db.execute(select(User).where(User.email == email))
     user = res.scalar_one_or_none()
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
 
     return user
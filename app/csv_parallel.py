@@ -0,0 +1,216 @@
+"""
+Parallel parse/validate stage for metrics CSV files.
+
+The file (already on disk) is split into byte ranges that start and end on
+line boundaries, and each range is parsed and validated in a worker
+process. A worker sends back its valid rows as a compact column batch
+(NumPy arrays, NaN for missing numbers, growth status as
+rules.GROWTH_STATUS_CODES) plus its row errors, instead of a list of
+per-row objects.
+
+iter_parsed_ranges yields ranges in file order as they finish, with file
+line numbers, so the caller can write each one while later ranges are
+still being parsed. Ranges are capped at MAX_RANGE_BYTES and at most
+`workers` are in flight ahead of the consumer, so memory does not grow
+with the file size.
+
+Splitting on raw newlines assumes no quoted field spans lines, which holds
+for the metrics columns (ids, dates, numbers and enum values).
+"""
+import asyncio
+import csv
+import io
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.crud import METRIC_INPUT_COLUMNS, metric_digest
+from app.importers import MAX_REPORTED_ERRORS, _row_error, metric_in, metric_inputs
+from app.rules import GROWTH_STATUS_CODES
+
+# Ranges below this size are not worth a round trip to a worker.
+MIN_RANGE_BYTES = 256 * 1024
+# Ranges above this size would hold too many parsed rows at once.
+MAX_RANGE_BYTES = 8 * 1024 * 1024
+# Ranges per worker, so one slow range does not leave the other workers idle.
+RANGES_PER_WORKER = 4
+
+
+@dataclass
+class MetricBatch:
+    """Validated metrics rows from one byte range, column-oriented."""
+    lines: np.ndarray             # int64, 1-based line number in the file
+    local_ids: list[str]
+    as_of_dates: np.ndarray       # datetime64[D]
+    attendance: np.ndarray        # float64, NaN = no data
+    growth_codes: np.ndarray      # int8
+    credits_earned: np.ndarray    # float64, NaN = no data
+    expected_credits: np.ndarray  # float64, NaN = no data
+    digests: list[str]            # crud.metric_digest of the input columns
+
+    def __len__(self) -> int:
+        return len(self.local_ids)
+
+    def slice(self, start: int, stop: int) -> "MetricBatch":
+        return MetricBatch(
+            lines=self.lines[start:stop],
+            local_ids=self.local_ids[start:stop],
+            as_of_dates=self.as_of_dates[start:stop],
+            attendance=self.attendance[start:stop],
+            growth_codes=self.growth_codes[start:stop],
+            credits_earned=self.credits_earned[start:stop],
+            expected_credits=self.expected_credits[start:stop],
+            digests=self.digests[start:stop],
+        )
+
+
+@dataclass
+class ParsedRange:
+    """One byte range: its valid rows and its row errors."""
+    batch: MetricBatch
+    line_count: int
+    error_count: int
+    errors: list[tuple[int, str]]  # (line, message), first MAX_REPORTED_ERRORS
+
+
+def split_ranges(
+    path: str, parts: int, min_bytes: int = MIN_RANGE_BYTES, max_bytes: int = MAX_RANGE_BYTES
+) -> tuple[list[str], list[tuple[int, int]]]:
+    """Header fields and (start, end) byte ranges covering the data lines: about `parts`, none over max_bytes."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        parts = max(1, min(parts, (size - data_start) // max(min_bytes, 1)), math.ceil((size - data_start) / max_bytes))
+        step = math.ceil((size - data_start) / parts) if size > data_start else 0
+        bounds = [data_start]
+        for i in range(1, parts):
+            f.seek(max(data_start + i * step, bounds[-1]))
+            f.readline()  # finish the line the cut landed in
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+    bounds.append(size)
+    fieldnames = next(csv.reader([header.decode("utf-8-sig")]), [])
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return fieldnames, ranges
+
+
+def _read_range(path: str, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _parse_rows(data: bytes, fieldnames: list[str]) -> Iterator[tuple]:
+    """(line within the range, local_student_id, MetricIn or None, error or None) per row."""
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames)
+    for row in reader:
+        try:
+            local_id = row["local_student_id"].strip()
+            payload = metric_in(row, metric_inputs(row))  # same validation as the per-row path
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            yield reader.line_num, None, None, e
+            continue
+        yield reader.line_num, local_id, payload, None
+
+
+def parse_metric_range(path: str, start: int, end: int, fieldnames: list[str]) -> ParsedRange:
+    """Parse and validate one byte range; lines are numbered within it. Runs in a worker process."""
+    data = _read_range(path, start, end)
+    line_count = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    lines, local_ids, dates, digests = [], [], [], []
+    attendance, growth, earned, expected = [], [], [], []
+    error_count, errors = 0, []
+    for line, local_id, payload, error in _parse_rows(data, fieldnames):
+        if error is not None:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(_row_error(line, error))
+            continue
+        lines.append(line)
+        local_ids.append(local_id)
+        dates.append(payload.as_of_date)
+        attendance.append(payload.attendance_percentage)
+        growth.append(GROWTH_STATUS_CODES[payload.growth_status])
+        earned.append(payload.credits_earned)
+        expected.append(payload.expected_credits_for_grade)
+        digests.append(metric_digest(getattr(payload, c) for c in METRIC_INPUT_COLUMNS))
+
+    batch = MetricBatch(
+        lines=np.array(lines, dtype=np.int64),
+        local_ids=local_ids,
+        as_of_dates=np.array(dates, dtype="datetime64[D]"),
+        attendance=np.array(attendance, dtype=np.float64),
+        growth_codes=np.array(growth, dtype=np.int8),
+        credits_earned=np.array(earned, dtype=np.float64),
+        expected_credits=np.array(expected, dtype=np.float64),
+        digests=digests,
+    )
+    return ParsedRange(batch=batch, line_count=line_count, error_count=error_count, errors=errors)
+
+
+async def _run(executor: Optional[Executor], fn, *args):
+    """fn(*args) on the worker pool, or inline in the threadpool when executor is None."""
+    if executor is None:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def iter_parsed_ranges(path: str, executor: Optional[Executor] = None, workers: int = 1) -> AsyncIterator[ParsedRange]:
+    """
+    Parse every range of the file and yield them in file order, with batch
+    lines and errors numbered by file line, keeping at most `workers` ranges
+    in flight ahead of the consumer.
+    """
+    fieldnames, ranges = await run_in_threadpool(split_ranges, path, max(workers, 1) * RANGES_PER_WORKER)
+    pending: deque = deque()
+    first_line = 2  # line 1 is the header
+    try:
+        for start, end in ranges:
+            pending.append(asyncio.ensure_future(_run(executor, parse_metric_range, path, start, end, fieldnames)))
+            if len(pending) > max(workers, 1):
+                parsed = await pending.popleft()
+                first_line = _number_lines(parsed, first_line)
+                yield parsed
+        while pending:
+            parsed = await pending.popleft()
+            first_line = _number_lines(parsed, first_line)
+            yield parsed
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _number_lines(parsed: ParsedRange, first_line: int) -> int:
+    """Shift a range's line numbers to file lines; returns the next range's first line."""
+    parsed.batch.lines += first_line - 1
+    parsed.errors = [(first_line - 1 + line, message) for line, message in parsed.errors]
+    return first_line + parsed.line_count
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def executor() -> Optional[ProcessPoolExecutor]:
+    """The shared worker pool, or None when import_parse_workers is 0 (parse inline)."""
+    global _executor
+    if _executor is None and settings.import_parse_workers > 0:
+        # spawn, not fork: the parent has an event loop, DB connections and threads.
+        _executor = ProcessPoolExecutor(settings.import_parse_workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
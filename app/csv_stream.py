@@ -0,0 +1,53 @@
+"""
+Incremental CSV parsing for uploaded files.
+
+Starlette has already spooled the upload (to disk once it is large), so we
+read it back in fixed-size blocks, decode incrementally and hand csv rows
+to the caller a chunk at a time. Memory stays bounded by the block and
+chunk sizes, not by the size of the file.
+"""
+import codecs
+import csv
+import itertools
+from typing import AsyncIterator, BinaryIO, Iterator
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines(raw: BinaryIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Yield decoded lines (with their newline) from a binary file, one block at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while True:
+        block = raw.read(block_size)
+        pending += decoder.decode(block, final=not block)
+        if not block:
+            break
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def take_rows(reader: Iterator[dict], n: int) -> list[dict]:
+    return list(itertools.islice(reader, n))
+
+
+async def iter_csv_chunks(
+    upload: UploadFile, chunk_size: int, block_size: int = READ_BLOCK_SIZE
+) -> AsyncIterator[list[dict]]:
+    """
+    Yield lists of up to chunk_size csv.DictReader rows from an upload.
+    The blocking reads run in the threadpool so the event loop stays free.
+    """
+    await upload.seek(0)
+    reader = csv.DictReader(iter_lines(upload.file, block_size))
+    while True:
+        chunk = await run_in_threadpool(take_rows, reader, chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,106 @@
+"""
+Streaming exports of students, and of student_metrics joined with their
+student (CSV or NDJSON).
+
+Rows come off a server-side cursor in fixed-size partitions and are encoded
+as they arrive, so memory use and time-to-first-byte do not depend on how
+many rows match. The export opens its own session: FastAPI closes
+dependency sessions before a StreamingResponse body is sent.
+"""
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from app.db import AsyncSessionLocal
+from app.models import Student, StudentMetric
+
+EXPORT_BATCH_SIZE = 2000
+
+STUDENT_COLUMNS = ("local_student_id", "first_name", "last_name", "grade_level", "diploma_path")
+METRIC_COLUMNS = (
+    "as_of_date",
+    "attendance_percentage",
+    "growth_status",
+    "credits_earned",
+    "expected_credits_for_grade",
+    "attendance_risk_flag",
+    "academic_risk_flag",
+    "graduation_risk_flag",
+    "risk_flag_count",
+    "student_status",
+    "intervention_required",
+    "created_at",
+    "updated_at",
+)
+EXPORT_COLUMNS = ("student_id",) + STUDENT_COLUMNS + ("metric_id",) + METRIC_COLUMNS
+STUDENT_EXPORT_COLUMNS = ("student_id",) + STUDENT_COLUMNS + ("row_version",)
+
+
+def students_export_query():
+    """Every student, with or without metrics; the metrics export only reaches students that have some."""
+    return select(Student.id, *(getattr(Student, c) for c in STUDENT_COLUMNS), Student.row_version).order_by(Student.id)
+
+
+def export_query(start: Optional[date] = None, end: Optional[date] = None, changed_since: Optional[datetime] = None):
+    stmt = (
+        select(
+            Student.id,
+            *(getattr(Student, c) for c in STUDENT_COLUMNS),
+            StudentMetric.id,
+            *(getattr(StudentMetric, c) for c in METRIC_COLUMNS),
+        )
+        .join(StudentMetric, StudentMetric.student_id == Student.id)
+        .order_by(StudentMetric.id)
+    )
+    if start is not None:
+        stmt = stmt.where(StudentMetric.as_of_date >= start)
+    if end is not None:
+        stmt = stmt.where(StudentMetric.as_of_date <= end)
+    if changed_since is not None:
+        stmt = stmt.where(StudentMetric.updated_at >= changed_since)
+    return stmt
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(rows, columns, header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_plain(v) for v in row] for row in rows)
+    return buf.getvalue()
+
+
+def _ndjson_lines(rows, columns) -> str:
+    return "".join(json.dumps(dict(zip(columns, map(_plain, row)))) + "\n" for row in rows)
+
+
+async def stream_rows(stmt, columns, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """Encode the rows of `stmt` (in `columns` order) as CSV or NDJSON while they stream in."""
+    if fmt == "csv":
+        # header first, before the query has produced anything
+        yield _csv_lines([], columns, header=True)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield _csv_lines(rows, columns, header=False) if fmt == "csv" else _ndjson_lines(rows, columns)
+
+
+def stream_export(fmt: str, batch_size: int = EXPORT_BATCH_SIZE, **filters) -> AsyncIterator[str]:
+    return stream_rows(export_query(**filters), EXPORT_COLUMNS, fmt, batch_size)
+
+
+def stream_students_export(fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    return stream_rows(students_export_query(), STUDENT_EXPORT_COLUMNS, fmt, batch_size)
@@ -0,0 +1,205 @@
+"""
+Background CSV imports.
+
+The upload is spooled to disk and a job row is created; a worker task then
+feeds the file through the same chunk importers as the synchronous
+endpoints. Each chunk commits together with the job's progress, so a job
+interrupted by a crash or shutdown resumes from its last committed chunk.
+A semaphore caps how many jobs run at once in this process.
+"""
+import asyncio
+import collections
+import csv
+import itertools
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.csv_stream import READ_BLOCK_SIZE, iter_lines, take_rows
+from app.db import AsyncSessionLocal
+from app.importers import (
+    MAX_REPORTED_ERRORS,
+    METRIC_IMPORT_CHUNK_SIZE,
+    STUDENT_IMPORT_CHUNK_SIZE,
+    import_metric_rows,
+    import_student_rows,
+)
+from app.models import ImportJob, JobStatus
+
+log = logging.getLogger(__name__)
+
+IMPORTERS = {
+    "students": (STUDENT_IMPORT_CHUNK_SIZE, import_student_rows),
+    "metrics": (METRIC_IMPORT_CHUNK_SIZE, import_metric_rows),
+}
+
+_slots: Optional[asyncio.Semaphore] = None
+_tasks: dict[int, asyncio.Task] = {}
+
+
+def spool_dir() -> str:
+    return settings.import_spool_dir or os.path.join(tempfile.gettempdir(), "student_risk_imports")
+
+
+def spool_upload(upload: UploadFile) -> tuple[str, int]:
+    os.makedirs(spool_dir(), exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".csv", dir=spool_dir())
+    newlines = 0
+    last = b""
+    with os.fdopen(fd, "wb") as out:
+        upload.file.seek(0)
+        while block := upload.file.read(READ_BLOCK_SIZE):
+            out.write(block)
+            newlines += block.count(b"\n")
+            last = block[-1:]
+    lines = newlines + (1 if last and last != b"\n" else 0)
+    # Quoted multi-line fields make this an estimate; it only feeds the ETA.
+    return path, max(lines - 1, 0)
+
+
+async def create_job(kind: str, upload: UploadFile, requested_by_user_id: Optional[int]) -> ImportJob:
+    path, total_rows = await run_in_threadpool(spool_upload, upload)
+    async with AsyncSessionLocal() as db:
+        job = ImportJob(
+            kind=kind,
+            filename=upload.filename,
+            spool_path=path,
+            total_rows=total_rows,
+            requested_by_user_id=requested_by_user_id,
+            counts={},
+            errors=[],
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    start_job(job.id)
+    return job
+
+
+def is_active(job_id: int) -> bool:
+    return job_id in _tasks
+
+
+def start_job(job_id: int) -> None:
+    if job_id in _tasks:
+        return
+    task = asyncio.create_task(_run_job(job_id), name=f"import-job-{job_id}")
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+
+
+async def shutdown() -> None:
+    """Cancel running jobs; each stops at a chunk boundary and stays resumable."""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def merge_counts(stored: dict, counts: Counter) -> dict:
+    """Add a chunk's counts to a job's stored counts, keeping keys whose total is zero."""
+    # Counter + Counter drops keys <= 0, so the stored JSON shape would vary between jobs.
+    merged = Counter(stored)
+    merged.update(counts)
+    return dict(merged)
+
+
+def _open_reader(path: str, skip: int):
+    f = open(path, "rb")
+    reader = csv.DictReader(iter_lines(f))
+    collections.deque(itertools.islice(reader, skip), maxlen=0)
+    return f, reader
+
+
+async def _run_job(job_id: int) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(settings.import_max_concurrent_jobs, 1))
+    async with _slots:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ImportJob, job_id)
+            if job is None or job.status == JobStatus.completed:
+                return
+            job.status = JobStatus.running
+            job.error = None
+            job.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+
+            chunk_size, import_rows = IMPORTERS[job.kind]
+            f, reader = await run_in_threadpool(_open_reader, job.spool_path, job.rows_processed)
+            started = time.perf_counter()
+            processed_this_run = 0
+            try:
+                while True:
+                    chunk = await run_in_threadpool(take_rows, reader, chunk_size)
+                    if not chunk:
+                        break
+                    counts, errors = await import_rows(db, chunk)
+                    first_row = job.rows_processed + 1
+                    room = MAX_REPORTED_ERRORS - len(job.errors)
+                    if errors and room > 0:
+                        job.errors = job.errors + [{"row": first_row + i, "message": m} for i, m in errors[:room]]
+                    job.error_count += len(errors)
+                    job.counts = merge_counts(job.counts, counts)
+                    job.rows_processed += len(chunk)
+                    processed_this_run += len(chunk)
+                    job.rows_per_second = round(processed_this_run / (time.perf_counter() - started), 1)
+                    job.updated_at = datetime.now(timezone.utc)
+                    await db.commit()
+            except asyncio.CancelledError:
+                await db.rollback()
+                await _mark_failed(db, job_id, "Interrupted; resume to continue from the last committed chunk")
+                raise
+            except Exception as e:
+                log.exception("import job %s failed after %s rows", job_id, job.rows_processed)
+                await db.rollback()
+                await _mark_failed(db, job_id, str(e)[:2000])
+                return
+            finally:
+                f.close()
+
+            job.status = JobStatus.completed
+            job.finished_at = job.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+            try:
+                os.remove(job.spool_path)
+            except OSError:
+                pass
+
+
+async def _mark_failed(db, job_id: int, message: str) -> None:
+    job = await db.get(ImportJob, job_id)
+    job.status = JobStatus.failed
+    job.error = message
+    job.updated_at = datetime.now(timezone.utc)
+    await db.commit()
+
+
+def job_out(job: ImportJob) -> dict:
+    remaining = max(job.total_rows - job.rows_processed, 0)
+    running = job.status == JobStatus.running and job.rows_per_second
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "filename": job.filename,
+        "total_rows": job.total_rows,
+        "rows_processed": job.rows_processed,
+        "counts": job.counts,
+        "error_count": job.error_count,
+        "errors": job.errors,
+        "rows_per_second": job.rows_per_second,
+        "eta_seconds": round(remaining / job.rows_per_second, 1) if running else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,176 @@
+"""
+Row parsing and chunk writers shared by the synchronous /imports endpoints
+and background import jobs (app.import_jobs).
+"""
+from collections import Counter
+from datetime import date
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import ValidationError
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.models import GrowthStatus
+
+if TYPE_CHECKING:
+    from app.csv_parallel import MetricBatch
+
+STUDENT_IMPORT_CHUNK_SIZE = 1000
+METRIC_IMPORT_CHUNK_SIZE = 1000
+
+# Cap on per-row errors kept for a report.
+MAX_REPORTED_ERRORS = 1000
+
+
+def student_create(row: dict) -> schemas.StudentCreate:
+    # CSV columns: local_student_id,first_name,last_name,grade_level,diploma_path
+    return schemas.StudentCreate(
+        local_student_id=row["local_student_id"].strip(),
+        first_name=row["first_name"].strip(),
+        last_name=row["last_name"].strip(),
+        grade_level=int(row["grade_level"]),
+        diploma_path=(row.get("diploma_path") or "").strip() or None,
+    )
+
+
+def metric_inputs(row: dict) -> tuple:
+    """The input columns of one metrics CSV row, in crud.METRIC_INPUT_COLUMNS order, normalized like every write path."""
+    return crud.metric_input_values((
+        float(row["attendance_percentage"]) if row.get("attendance_percentage") else None,
+        GrowthStatus(row["growth_status"]) if row.get("growth_status") else GrowthStatus.no_data,
+        int(row["credits_earned"]) if row.get("credits_earned") else None,
+        int(row["expected_credits_for_grade"]) if row.get("expected_credits_for_grade") else None,
+    ))
+
+
+def metric_in(row: dict, inputs: tuple | None = None) -> schemas.MetricIn:
+    # CSV columns: local_student_id,as_of_date,attendance_percentage,growth_status,credits_earned,expected_credits_for_grade
+    if inputs is None:
+        inputs = metric_inputs(row)
+    return schemas.MetricIn(
+        as_of_date=date.fromisoformat(row["as_of_date"]),
+        **dict(zip(crud.METRIC_INPUT_COLUMNS, inputs)),
+    )
+
+
+def metric_item(item) -> tuple[int | None, str | None, schemas.MetricIn]:
+    """Split a POST /metrics/batch item into (student_id, local_student_id, MetricIn); exactly one id is set."""
+    if not isinstance(item, dict):
+        raise ValueError("Item must be a JSON object")
+    fields = dict(item)
+    student_id = fields.pop("student_id", None)
+    local_id = fields.pop("local_student_id", None)
+    if (student_id is None) == (local_id is None):
+        raise ValueError("Give exactly one of student_id or local_student_id")
+    if student_id is not None and (isinstance(student_id, bool) or not isinstance(student_id, int)):
+        raise ValueError("student_id must be an integer")
+    if local_id is not None:
+        local_id = str(local_id).strip()
+    return student_id, local_id, schemas.MetricIn(**fields)
+
+
+def item_error(e: Exception) -> str:
+    """One-line message for a batch item, naming the offending fields."""
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+    return _row_error(0, e)[1]
+
+
+def _row_error(index: int, e: Exception) -> tuple[int, str]:
+    if isinstance(e, KeyError):
+        return index, f"Missing column: {e.args[0]}"
+    return index, str(e).splitlines()[0] if str(e) else type(e).__name__
+
+
+async def import_student_rows(db: AsyncSession, rows: list[dict]) -> tuple[Counter, list[tuple[int, str]]]:
+    """
+    Parse and upsert one chunk of students CSV rows (caller commits).
+    Returns counts and (index in chunk, message) for rows that were skipped.
+    """
+    payloads, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            payloads.append(student_create(row).model_dump())
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            errors.append(_row_error(i, e))
+    # upsert by local_student_id
+    created, updated, unchanged = await crud.upsert_students(db, payloads)
+    return Counter(created=created, updated=updated, unchanged=unchanged), errors
+
+
+async def import_metric_rows(db: AsyncSession, rows: list[dict]) -> tuple[Counter, list[tuple[int, str]]]:
+    """
+    Parse, rule-evaluate and upsert one chunk of metrics CSV rows (caller commits).
+
+    Rows whose input digest matches the stored row for the same
+    (student, as_of_date) are counted as unchanged and skip validation,
+    rule evaluation and the write, so re-importing a file is mostly reads.
+    Returns counts and (index in chunk, message) for rows that were skipped.
+    """
+    parsed, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            local_id = row["local_student_id"].strip()
+            as_of_date = date.fromisoformat(row["as_of_date"])
+            inputs = metric_inputs(row)
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            errors.append(_row_error(i, e))
+            continue
+        parsed.append((i, local_id, as_of_date, inputs))
+
+    # One lookup per chunk instead of a SELECT per row.
+    student_ids = await crud.student_ids_by_local_id(db, {local_id for _, local_id, _, _ in parsed})
+    known = []
+    for i, local_id, as_of_date, inputs in parsed:
+        if local_id in student_ids:
+            known.append((i, student_ids[local_id], as_of_date, inputs))
+        else:
+            errors.append((i, f"Unknown local_student_id: {local_id}"))
+
+    stored = await crud.metric_digests(db, {(student_id, as_of_date) for _, student_id, as_of_date, _ in known})
+    unchanged = 0
+    student_id_list, payloads = [], []
+    for i, student_id, as_of_date, inputs in known:
+        key = (student_id, as_of_date)
+        if key in stored and stored[key] == crud.metric_digest(inputs):
+            unchanged += 1
+            continue
+        try:
+            payloads.append(metric_in(rows[i], inputs))
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            errors.append(_row_error(i, e))
+            continue
+        student_id_list.append(student_id)
+    errors.sort()
+
+    metric_rows = crud.metric_rows(student_id_list, payloads)
+    created, updated = await crud.upsert_metrics(db, metric_rows)
+    return Counter(imported=len(metric_rows), created=created, updated=updated, unchanged=unchanged), errors
+
+
+async def import_metric_batch(db: AsyncSession, batch: "MetricBatch", student_ids: dict[str, int]) -> Counter:
+    """
+    Upsert a validated app.csv_parallel batch (caller commits). Every
+    local_student_id must already be resolved in student_ids. Rows whose
+    input digest matches the stored row are counted as unchanged.
+    """
+    sids = [student_ids[local_id] for local_id in batch.local_ids]
+    dates = batch.as_of_dates.tolist()
+    stored = await crud.metric_digests(db, set(zip(sids, dates)))
+    keep = np.fromiter(
+        (stored.get(key) != digest for key, digest in zip(zip(sids, dates), batch.digests)),
+        dtype=bool,
+        count=len(batch),
+    )
+    metric_rows = crud.metric_column_rows(
+        [sid for sid, k in zip(sids, keep) if k],
+        [d for d, k in zip(dates, keep) if k],
+        batch.attendance[keep],
+        batch.growth_codes[keep],
+        batch.credits_earned[keep],
+        batch.expected_credits[keep],
+    )
+    created, updated = await crud.upsert_metrics(db, metric_rows)
+    return Counter(imported=len(metric_rows), created=created, updated=updated, unchanged=len(batch) - len(metric_rows))
@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app import csv_parallel, import_jobs, rescore
+from app.audit import audit_sink
 from app.config import settings
-from app.routers import auth, students, metrics, imports, admin
+from app.db import warm_pool
+from app.routers import auth, students, metrics, imports, admin, rollups, snapshots, telemetry, transitions
+from app.telemetry import TelemetryMiddleware
 
-app = FastAPI(title="Student Risk Platform (Starter)", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_pool(min(settings.db_pool_warm_connections, settings.db_pool_size))
+    await audit_sink.start()
+    try:
+        yield
+    finally:
+        await import_jobs.shutdown()
+        await rescore.shutdown()
+        csv_parallel.shutdown()
+        await audit_sink.stop()
+
+app = FastAPI(title="Student Risk Platform (Starter)", version="0.1.0", lifespan=lifespan)
 
 origins = settings.cors_origin_list()
 if origins:
@@ -15,11 +32,17 @@ if origins:
         allow_headers=["*"],
     )
 
+app.add_middleware(TelemetryMiddleware, slow_request_seconds=settings.slow_request_threshold_ms / 1000)
+
 app.include_router(auth.router)
 app.include_router(students.router)
 app.include_router(metrics.router)
 app.include_router(imports.router)
 app.include_router(admin.router)
+app.include_router(rollups.router)
+app.include_router(transitions.router)
+app.include_router(snapshots.router)
+app.include_router(telemetry.router)
 
 @app.get("/health")
 async def health():
@@ -0,0 +1,113 @@
+"""
+Operational commands.
+
+    python -m app.manage backfill-current-status
+    python -m app.manage rebuild-rollups
+    python -m app.manage check-rollups
+    python -m app.manage rebuild-transitions
+    python -m app.manage create-partitions [--ahead 1] [--from-year 2019]
+    python -m app.manage archive-partition --year 2019 [--dir metrics_archive]
+    python -m app.manage restore-partition metrics_archive/student_metrics_sy2019.csv.gz
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from app import crud, partitions
+from app.db import AsyncSessionLocal
+
+
+async def backfill_current_status(args) -> None:
+    async with AsyncSessionLocal() as db:
+        students = await crud.rebuild_current_status(db)
+        await db.commit()
+    print(f"student_current_status rebuilt for {students} students")
+
+
+async def rebuild_rollups(args) -> None:
+    async with AsyncSessionLocal() as db:
+        buckets = await crud.rebuild_risk_rollups(db)
+        await db.commit()
+    print(f"risk_rollups rebuilt: {buckets} buckets")
+
+
+async def check_rollups(args) -> None:
+    async with AsyncSessionLocal() as db:
+        drift = await crud.risk_rollup_drift(db)
+    for bucket in drift:
+        print(bucket)
+    print("risk_rollups consistent" if not drift else f"{len(drift)} buckets disagree; run rebuild-rollups")
+    if drift:
+        raise SystemExit(1)
+
+
+async def rebuild_transitions(args) -> None:
+    async with AsyncSessionLocal() as db:
+        transitions = await crud.rebuild_status_transitions(db)
+        await db.commit()
+    print(f"student_status_transitions rebuilt: {transitions} transitions")
+
+
+async def create_partitions(args) -> None:
+    current = partitions.school_year(date.today())
+    async with AsyncSessionLocal() as db:
+        created = await partitions.create_partitions(db, args.from_year or current, current + args.ahead)
+        await db.commit()
+    for name in created:
+        print(f"created {name}")
+    print(f"{len(created)} partitions created")
+
+
+async def archive_partition(args) -> None:
+    async with AsyncSessionLocal() as db:
+        path, rows = await partitions.archive_partition(db, args.year, args.dir)
+        await db.commit()
+    print(f"archived {rows} rows to {path}")
+
+
+async def restore_partition(args) -> None:
+    async with AsyncSessionLocal() as db:
+        year, rows = await partitions.restore_partition(db, args.path)
+        await db.commit()
+    print(f"restored {rows} rows into {partitions.partition_name(year)}")
+
+
+COMMANDS = {
+    "backfill-current-status": (backfill_current_status, "Rebuild student_current_status from student_metrics"),
+    "rebuild-rollups": (rebuild_rollups, "Recompute risk_rollups from student_metrics"),
+    "check-rollups": (check_rollups, "Compare risk_rollups with a live GROUP BY; exit 1 on drift"),
+    "rebuild-transitions": (rebuild_transitions, "Recompute student_status_transitions from student_metrics"),
+    "create-partitions": (create_partitions, "Create student_metrics school-year partitions ahead of time"),
+    "archive-partition": (archive_partition, "Detach a school year of student_metrics and archive it to gzip CSV"),
+    "restore-partition": (restore_partition, "Load an archived school year and attach it again"),
+}
+
+ARGUMENTS = {
+    "create-partitions": [
+        (("--ahead",), {"type": int, "default": 1, "help": "school years after the current one"}),
+        (("--from-year",), {"type": int, "help": "first school year (default: the current one)"}),
+    ],
+    "archive-partition": [
+        (("--year",), {"type": int, "required": True, "help": "school year, by the year it starts in"}),
+        (("--dir",), {"default": "metrics_archive"}),
+    ],
+    "restore-partition": [
+        (("path",), {}),
+    ],
+}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        command = sub.add_parser(name, help=help_text)
+        for flags, options in ARGUMENTS.get(name, []):
+            command.add_argument(*flags, **options)
+    args = parser.parse_args(argv)
+    handler, _ = COMMANDS[args.command]
+    asyncio.run(handler(args))
+
+
+if __name__ == "__main__":
+    main()
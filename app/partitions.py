@@ -0,0 +1,151 @@
+"""
+School-year partitions of student_metrics.
+
+student_metrics is range-partitioned on as_of_date with one partition per
+school year (August to July) plus a DEFAULT partition that catches dates no
+year partition covers yet. Old years can be detached and archived to a
+gzip CSV, then restored and re-attached later.
+
+Archiving removes the year's metrics and their risk_rollups buckets, and
+repoints student_current_status for students whose latest metric was in
+that year at their newest remaining metric (or drops the row when there is
+none), so detail and roster never show a status with no metric behind it.
+Restoring does the reverse. Materialized status snapshots are kept, so
+board reports for archived years still work.
+"""
+import gzip
+import os
+import re
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+
+PARENT = "student_metrics"
+DEFAULT_PARTITION = "student_metrics_default"
+SCHOOL_YEAR_START_MONTH = crud.FALL_TERM_START_MONTH
+
+_BOUND = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+_ARCHIVE_NAME = re.compile(r"student_metrics_sy(\d{4})\.csv\.gz$")
+
+
+def school_year(d: date) -> int:
+    """The calendar year a date's school year starts in."""
+    return d.year if d.month >= SCHOOL_YEAR_START_MONTH else d.year - 1
+
+
+def year_bounds(year: int) -> tuple[date, date]:
+    """[start, end) of a school year's partition."""
+    return date(year, SCHOOL_YEAR_START_MONTH, 1), date(year + 1, SCHOOL_YEAR_START_MONTH, 1)
+
+
+def partition_name(year: int) -> str:
+    return f"{PARENT}_sy{year}"
+
+
+def archive_path(directory: str, year: int) -> str:
+    return os.path.join(directory, f"{partition_name(year)}.csv.gz")
+
+
+async def list_partitions(db: AsyncSession) -> list[dict]:
+    """Attached year partitions in date order (the DEFAULT partition is not listed)."""
+    res = await db.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT})
+    out = []
+    for name, bound in res.all():
+        m = _BOUND.search(bound or "")
+        if m:
+            out.append({"name": name, "start": date.fromisoformat(m[1]), "end": date.fromisoformat(m[2])})
+    return sorted(out, key=lambda p: p["start"])
+
+
+async def _attach(db: AsyncSession, year: int) -> None:
+    # Rows already sitting in the DEFAULT partition for this range move into
+    # the new table first; Postgres refuses the ATTACH while any remain there.
+    start, end = year_bounds(year)
+    name = partition_name(year)
+    bounds = {"start": start, "end": end}
+    await db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE as_of_date >= :start AND as_of_date < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    await db.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+async def create_partitions(db: AsyncSession, first_year: int, last_year: int) -> list[str]:
+    """Create any missing year partitions in [first_year, last_year]. Caller commits."""
+    existing = {p["name"] for p in await list_partitions(db)}
+    created = []
+    for year in range(first_year, last_year + 1):
+        name = partition_name(year)
+        if name in existing:
+            continue
+        await db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+        await _attach(db, year)
+        created.append(name)
+    return created
+
+
+async def _driver_connection(db: AsyncSession):
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def archive_partition(db: AsyncSession, year: int, directory: str) -> tuple[str, int]:
+    """
+    Detach a year partition, write it to <directory>/student_metrics_sy<year>.csv.gz,
+    drop it and its rollup buckets, and repoint the latest-status projection
+    of its students. Returns (path, rows). Caller commits; the archive file is
+    complete before the DROP is committed.
+    """
+    name = partition_name(year)
+    if name not in {p["name"] for p in await list_partitions(db)}:
+        raise ValueError(f"{name} is not an attached partition")
+    start, end = year_bounds(year)
+    rows = (await db.execute(text(f"SELECT count(*) FROM {name}"))).scalar_one()
+    await db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+
+    os.makedirs(directory, exist_ok=True)
+    path = archive_path(directory, year)
+    tmp = path + ".partial"
+    conn = await _driver_connection(db)
+    with gzip.open(tmp, "wb") as out:
+        await conn.copy_from_table(name, output=out, format="csv", header=True)
+    os.replace(tmp, path)
+
+    await db.execute(text(f"DROP TABLE {name}"))
+    await crud.rebuild_risk_rollups(db, start=start, end=end - timedelta(days=1))
+    await crud.repoint_current_status(db, start, end - timedelta(days=1))
+    return path, rows
+
+
+async def restore_partition(db: AsyncSession, path: str) -> tuple[int, int]:
+    """Load an archive written by archive_partition and attach it again. Returns (year, rows). Caller commits."""
+    m = _ARCHIVE_NAME.search(os.path.basename(path))
+    if not m:
+        raise ValueError(f"{path} is not a student_metrics_sy<year>.csv.gz archive")
+    year = int(m[1])
+    name = partition_name(year)
+    if name in {p["name"] for p in await list_partitions(db)}:
+        raise ValueError(f"{name} is already attached")
+
+    await db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    conn = await _driver_connection(db)
+    with gzip.open(path, "rb") as f:
+        # Name the archived columns so a later column addition does not shift them.
+        columns = f.readline().decode().strip().split(",")
+        await conn.copy_to_table(name, source=f, columns=columns, format="csv")
+    rows = (await db.execute(text(f"SELECT count(*) FROM {name}"))).scalar_one()
+    await _attach(db, year)
+
+    start, end = year_bounds(year)
+    await crud.rebuild_risk_rollups(db, start=start, end=end - timedelta(days=1))
+    await crud.repoint_current_status(db, start, end - timedelta(days=1))
+    return year, rows
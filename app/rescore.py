@@ -0,0 +1,185 @@
+"""
+Re-score stored student_metrics rows after a rule or threshold change.
+
+The job walks student_metrics in id order (keyset, never OFFSET), evaluates
+each chunk with evaluate_rules_batch and writes back only the rows whose
+computed outputs changed. Every chunk commits together with the job's
+checkpoint, so an interrupted run resumes from the last committed chunk.
+Jobs run as tasks owned by this module (like app.import_jobs), so app
+shutdown cancels them at a chunk boundary instead of leaving them running.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+
+from app import crud, models
+from app.crud import METRIC_RESULT_COLUMNS
+from app.db import AsyncSessionLocal
+from app.models import JobStatus, RescoreJob, StudentMetric
+from app.rules import STUDENT_STATUS_BY_CODE, evaluate_rules_batch, growth_status_codes
+
+log = logging.getLogger(__name__)
+
+RESCORE_CHUNK_SIZE = 5000
+
+# pg_advisory_xact_lock key that serializes "is a job unfinished? if not, create one".
+START_LOCK_KEY = 0x52_45_53_43  # "RESC"
+
+# Running jobs in this process, keyed by job id.
+_tasks: dict[int, asyncio.Task] = {}
+
+
+def is_active(job_id: int) -> bool:
+    return job_id in _tasks
+
+
+def start_job(job_id: int) -> None:
+    if job_id in _tasks:
+        return
+    task = asyncio.create_task(run_rescore_job(job_id), name=f"rescore-job-{job_id}")
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+
+
+async def shutdown() -> None:
+    """Cancel running jobs; each stops at a chunk boundary and stays resumable."""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def create_job(db, requested_by_user_id: int | None) -> tuple[RescoreJob | None, int | None]:
+    """
+    Insert and commit a new job unless one is unfinished; returns (job, None)
+    or (None, unfinished job id). The check and insert run under a transaction
+    advisory lock, so concurrent requests cannot both create one.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(START_LOCK_KEY)))
+    res = await db.execute(
+        select(RescoreJob.id).where(RescoreJob.status != JobStatus.completed).order_by(RescoreJob.id.desc()).limit(1)
+    )
+    unfinished = res.scalar_one_or_none()
+    if unfinished is not None:
+        await db.rollback()
+        return None, unfinished
+    job = RescoreJob(requested_by_user_id=requested_by_user_id)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job, None
+
+
+def _changed_rows(rows) -> list[tuple]:
+    """(stored row, fresh rule outputs) for every row whose outputs differ."""
+    out = evaluate_rules_batch(
+        [r.attendance_percentage for r in rows],
+        growth_status_codes([r.growth_status for r in rows]),
+        [r.credits_earned for r in rows],
+        [r.expected_credits_for_grade for r in rows],
+    )
+    fresh = {c: getattr(out, c).tolist() for c in METRIC_RESULT_COLUMNS}
+    fresh["student_status"] = [STUDENT_STATUS_BY_CODE[code] for code in fresh["student_status"]]
+
+    changed = []
+    for i, row in enumerate(rows):
+        values = {c: fresh[c][i] for c in METRIC_RESULT_COLUMNS}
+        if any(getattr(row, c) != v for c, v in values.items()):
+            changed.append((row, values))
+    return changed
+
+
+async def rescore_chunk(db, after_id: int, limit: int) -> tuple[int, int, int]:
+    """
+    Re-score up to `limit` metrics with id > after_id.
+    Returns (last_id, scanned, changed); scanned == 0 means the table is exhausted.
+    """
+    res = await db.execute(
+        select(
+            StudentMetric.id,
+            StudentMetric.student_id,
+            StudentMetric.as_of_date,
+            StudentMetric.attendance_percentage,
+            StudentMetric.growth_status,
+            StudentMetric.credits_earned,
+            StudentMetric.expected_credits_for_grade,
+            *(getattr(StudentMetric, c) for c in METRIC_RESULT_COLUMNS),
+        )
+        .where(StudentMetric.id > after_id)
+        .order_by(StudentMetric.id)
+        .limit(limit)
+    )
+    rows = res.all()
+    if not rows:
+        return after_id, 0, 0
+    changed = _changed_rows(rows)
+    if changed:
+        # ORM bulk UPDATE by primary key (id, as_of_date): one executemany for the chunk.
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            update(models.StudentMetric),
+            [{"id": row.id, "as_of_date": row.as_of_date, **values, "updated_at": now} for row, values in changed],
+        )
+        await crud.sync_current_status(db, [row.id for row, _ in changed])
+        await crud.apply_rollup_deltas(
+            db,
+            removed=[row._asdict() for row, _ in changed],
+            added=[{**row._asdict(), **values} for row, values in changed],
+        )
+        await crud.record_transitions(db, [
+            (row.student_id, row.as_of_date)
+            for row, values in changed
+            if crud.transition_state(row) != crud.transition_state(values)
+        ])
+        await crud.invalidate_snapshots(db, min(row.as_of_date for row, _ in changed))
+    return rows[-1].id, len(rows), len(changed)
+
+
+async def run_rescore_job(job_id: int, chunk_size: int = RESCORE_CHUNK_SIZE) -> None:
+    """Run a job to completion in the caller's task; start_job runs it as a managed task."""
+    async with AsyncSessionLocal() as db:
+        job = await db.get(RescoreJob, job_id)
+        if job is None or job.status == JobStatus.completed:
+            return
+        job.status = JobStatus.running
+        job.error = None
+        await db.commit()
+
+        started = time.perf_counter()
+        scanned_this_run = 0
+        try:
+            while True:
+                last_id, scanned, changed = await rescore_chunk(db, job.last_metric_id, chunk_size)
+                if not scanned:
+                    break
+                scanned_this_run += scanned
+                job.last_metric_id = last_id
+                job.rows_scanned += scanned
+                job.rows_changed += changed
+                job.rows_per_second = round(scanned_this_run / (time.perf_counter() - started), 1)
+                job.updated_at = datetime.now(timezone.utc)
+                await db.commit()
+        except asyncio.CancelledError:
+            await db.rollback()
+            await _mark_failed(db, job_id, "Interrupted; resume to continue from the last committed chunk")
+            raise
+        except Exception as e:
+            log.exception("rescore job %s failed after metric id %s", job_id, job.last_metric_id)
+            await db.rollback()
+            await _mark_failed(db, job_id, str(e)[:2000])
+            return
+
+        job.status = JobStatus.completed
+        job.finished_at = job.updated_at = datetime.now(timezone.utc)
+        await db.commit()
+
+
+async def _mark_failed(db, job_id: int, message: str) -> None:
+    job = await db.get(RescoreJob, job_id)
+    job.status = JobStatus.failed
+    job.error = message
+    job.updated_at = datetime.now(timezone.utc)
+    await db.commit()
@@ -1,12 +1,16 @@
+from datetime import date, datetime
+from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
-from app import crud
-from app.models import Role
+from app.db import engine, get_db, pool_metrics
+from app import crud, export, rescore, security
+from app.audit import audit_sink
+from app.models import JobStatus, RescoreJob, Role
 from app.schemas import UserCreate, UserOut
 from app.rbac import require_roles
-from app.deps import get_current_user
+from app.deps import get_current_user, principal_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -28,4 +32,121 @@ async def create_user_admin_or_counselor(
             detail="Counselors cannot create admin users",
         )
 
-    return await crud.create_user(db, payload)
+    user = await crud.create_user(db, payload)
+    await crud.log_action(db, current_user.id, "user.create", "user", str(user.id))
+    return user
+
+
+def _rescore_job_out(job: RescoreJob) -> dict:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "last_metric_id": job.last_metric_id,
+        "rows_scanned": job.rows_scanned,
+        "rows_changed": job.rows_changed,
+        "rows_per_second": job.rows_per_second,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+@router.post("/rescore", dependencies=[Depends(require_roles(Role.admin))])
+async def start_rescore(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserOut = Depends(get_current_user),
+):
+    """Re-evaluate every stored metric against the current rules."""
+    job, unfinished = await rescore.create_job(db, current_user.id)
+    if unfinished is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Rescore job {unfinished} has not completed; resume it via /admin/rescore/{unfinished}/resume",
+        )
+    rescore.start_job(job.id)
+    await crud.log_action(db, current_user.id, "rescore.start", "rescore_job", str(job.id))
+    return _rescore_job_out(job)
+
+
+@router.post("/rescore/{job_id}/resume", dependencies=[Depends(require_roles(Role.admin))])
+async def resume_rescore(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserOut = Depends(get_current_user),
+):
+    job = await db.get(RescoreJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Rescore job not found")
+    if job.status == JobStatus.completed:
+        raise HTTPException(status_code=400, detail="Rescore job already completed")
+    if rescore.is_active(job_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Rescore job is already running")
+    rescore.start_job(job.id)
+    await crud.log_action(db, current_user.id, "rescore.resume", "rescore_job", str(job_id))
+    return _rescore_job_out(job)
+
+
+@router.get("/rescore/{job_id}", dependencies=[Depends(require_roles(Role.admin))])
+async def get_rescore(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(RescoreJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Rescore job not found")
+    return _rescore_job_out(job)
+
+
+@router.get("/rollups/check", dependencies=[Depends(require_roles(Role.admin))])
+async def check_rollups(db: AsyncSession = Depends(get_db)):
+    """Compare risk_rollups with a live GROUP BY over student_metrics."""
+    drift = await crud.risk_rollup_drift(db)
+    return {"consistent": not drift, "mismatched_buckets": drift}
+
+
+@router.post("/rollups/rebuild", dependencies=[Depends(require_roles(Role.admin))])
+async def rebuild_rollups(db: AsyncSession = Depends(get_db), current_user: UserOut = Depends(get_current_user)):
+    buckets = await crud.rebuild_risk_rollups(db)
+    await db.commit()
+    await crud.log_action(db, current_user.id, "rollups.rebuild")
+    return {"buckets": buckets}
+
+
+@router.get("/export/metrics", dependencies=[Depends(require_roles(Role.admin))])
+async def export_metrics(
+    format: Literal["csv", "ndjson"] = "csv",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    changed_since: Optional[datetime] = None,
+):
+    """
+    Stream every student_metrics row joined with its student.
+    start/end filter on as_of_date; changed_since filters on the metric's updated_at, which
+    metric upserts and re-scores bump, so corrected rows are included.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export.stream_export(format, start=start, end=end, changed_since=changed_since),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="student_metrics.{format}"'},
+    )
+
+
+@router.get("/export/students", dependencies=[Depends(require_roles(Role.admin))])
+async def export_students(format: Literal["csv", "ndjson"] = "csv"):
+    """Stream every student, including those with no metrics yet; join to the metrics export on student_id."""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export.stream_students_export(format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="students.{format}"'},
+    )
+
+
+@router.get("/stats", dependencies=[Depends(require_roles(Role.admin))])
+async def runtime_stats():
+    """In-process counters for this worker."""
+    return {
+        "password_hasher": security.hasher_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "audit_sink": audit_sink.stats(),
+        "db_pool": pool_metrics.stats(engine),
+    }
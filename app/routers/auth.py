@@ -39,7 +39,9 @@ async def register_user(
     if payload.role != Role.admin:
         raise HTTPException(status_code=400, detail="First user must be admin")
 
-    return await crud.create_user(db, payload)
+    user = await crud.create_user(db, payload)
+    await crud.log_action(db, user.id, "user.register", "user", str(user.id))
+    return user
 
 
 @router.post("/token", response_model=Token)
@@ -1,66 +1,120 @@
-import csv
-import io
-from datetime import date
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import os
+import time
+from collections import Counter
+from contextlib import aclosing
+from typing import Literal
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app import crud, csv_parallel, import_jobs
+from app.config import settings
 from app.db import get_db
-from app.deps import require_roles
-from app.models import Role, Student, GrowthStatus
-from app import crud, schemas
+from app.deps import get_current_user, require_roles
+from app.models import ImportJob, JobStatus, Role
+from app.csv_stream import iter_csv_chunks
+from app.importers import (
+    MAX_REPORTED_ERRORS,
+    METRIC_IMPORT_CHUNK_SIZE,
+    STUDENT_IMPORT_CHUNK_SIZE,
+    import_metric_batch,
+    import_student_rows,
+)
 
 router = APIRouter(prefix="/imports", tags=["imports"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
 
 @router.post("/students_csv", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def import_students_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+async def import_students_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
     # CSV columns: local_student_id,first_name,last_name,grade_level,diploma_path
-    raw = await file.read()
-    text = raw.decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(text))
-    created = 0
-    for row in reader:
-        payload = schemas.StudentCreate(
-            local_student_id=row["local_student_id"].strip(),
-            first_name=row["first_name"].strip(),
-            last_name=row["last_name"].strip(),
-            grade_level=int(row["grade_level"]),
-            diploma_path=(row.get("diploma_path") or "").strip() or None,
-        )
-        # upsert by local_student_id
-        res = await db.execute(select(Student).where(Student.local_student_id == payload.local_student_id))
-        existing = res.scalar_one_or_none()
-        if existing:
-            existing.first_name = payload.first_name
-            existing.last_name = payload.last_name
-            existing.grade_level = payload.grade_level
-            existing.diploma_path = payload.diploma_path
-        else:
-            db.add(Student(**payload.model_dump()))
-            created += 1
+    # Chunks are written as they stream in but committed once, so a bad row rejects the whole upload.
+    totals = Counter(created=0, updated=0, unchanged=0)
+    async for chunk in iter_csv_chunks(file, STUDENT_IMPORT_CHUNK_SIZE):
+        counts, errors = await import_student_rows(db, chunk)
+        if errors:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=errors[0][1])
+        totals.update(counts)
     await db.commit()
-    return {"created": created}
+    await crud.log_action(db, current_user.id, "import.students_csv")
+    return dict(totals)
 
 @router.post("/metrics_csv", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def import_metrics_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+async def import_metrics_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
     # CSV columns: local_student_id,as_of_date,attendance_percentage,growth_status,credits_earned,expected_credits_for_grade
-    raw = await file.read()
-    text = raw.decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(text))
-    imported = 0
-    for row in reader:
-        local_id = row["local_student_id"].strip()
-        res = await db.execute(select(Student).where(Student.local_student_id == local_id))
-        student = res.scalar_one_or_none()
-        if not student:
-            raise HTTPException(status_code=400, detail=f"Unknown local_student_id: {local_id}")
+    started = time.perf_counter()
+    # Ranges are parsed and validated on the worker pool and each one is written as soon as it
+    # comes back clean, while later ranges are still parsing. Everything is one transaction: after
+    # the first bad row nothing more is written, the rest of the file is only checked for the error
+    # report, and the import rolls back.
+    pool, workers = csv_parallel.executor(), settings.import_parse_workers
+    path, _ = await run_in_threadpool(import_jobs.spool_upload, file)
+    totals = Counter(imported=0, created=0, updated=0, unchanged=0)
+    rows, error_count, errors = 0, 0, []
+    student_ids: dict[str, int] = {}
+    try:
+        async with aclosing(csv_parallel.iter_parsed_ranges(path, pool, workers)) as ranges:
+            async for parsed in ranges:
+                batch = parsed.batch
+                rows += len(batch)
+                missing = set(batch.local_ids) - student_ids.keys()
+                if missing:
+                    student_ids.update(await crud.student_ids_by_local_id(db, missing))
+                unknown = [
+                    (int(line), f"Unknown local_student_id: {local_id}")
+                    for line, local_id in zip(batch.lines, batch.local_ids)
+                    if local_id not in student_ids
+                ]
+                error_count += parsed.error_count + len(unknown)
+                errors.extend(sorted(parsed.errors + unknown)[:MAX_REPORTED_ERRORS - len(errors)])
+                if error_count:
+                    continue
+                for start in range(0, len(batch), METRIC_IMPORT_CHUNK_SIZE):
+                    totals.update(await import_metric_batch(db, batch.slice(start, start + METRIC_IMPORT_CHUNK_SIZE), student_ids))
+        if error_count:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail={
+                "message": f"{error_count} invalid rows; nothing was imported",
+                "error_count": error_count,
+                "errors": [{"line": line, "message": message} for line, message in errors],
+            })
+        await db.commit()
+    finally:
+        os.remove(path)
 
-        payload = schemas.MetricIn(
-            as_of_date=date.fromisoformat(row["as_of_date"]),
-            attendance_percentage=float(row["attendance_percentage"]) if row.get("attendance_percentage") else None,
-            growth_status=GrowthStatus(row["growth_status"]) if row.get("growth_status") else GrowthStatus.no_data,
-            credits_earned=int(row["credits_earned"]) if row.get("credits_earned") else None,
-            expected_credits_for_grade=int(row["expected_credits_for_grade"]) if row.get("expected_credits_for_grade") else None,
-        )
-        await crud.add_metric(db, student.id, payload)
-        imported += 1
-    return {"imported": imported}
+    await crud.log_action(db, current_user.id, "import.metrics_csv")
+    elapsed = time.perf_counter() - started
+    return {
+        **totals,
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+    }
+
+@router.post("/jobs/{kind}", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def create_import_job(
+    kind: Literal["students", "metrics"],
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """Spool the upload and import it in the background; poll GET /imports/jobs/{id} for progress."""
+    job = await import_jobs.create_job(kind, file, requested_by_user_id=user.id)
+    await crud.log_action(db, user.id, f"import_job.create.{kind}", "import_job", str(job.id))
+    return import_jobs.job_out(job)
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def get_import_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return import_jobs.job_out(job)
+
+@router.post("/jobs/{job_id}/resume", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def resume_import_job(job_id: int, db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job.status == JobStatus.completed:
+        raise HTTPException(status_code=400, detail="Import job already completed")
+    if import_jobs.is_active(job_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import job is already running")
+    import_jobs.start_job(job_id)
+    await crud.log_action(db, current_user.id, "import_job.resume", "import_job", str(job_id))
+    return import_jobs.job_out(job)
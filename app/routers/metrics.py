@@ -1,15 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import zlib
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
 from app.db import get_db
 from app import schemas, crud
-from app.deps import require_roles
+from app.importers import METRIC_IMPORT_CHUNK_SIZE, item_error, metric_item
+from app.deps import get_current_user, require_roles
 from app.models import Role
 
 router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
 
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
 @router.post("/students/{student_id}", response_model=schemas.MetricOut, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def add_metric(student_id: int, payload: schemas.MetricIn, db: AsyncSession = Depends(get_db)):
+async def add_metric(student_id: int, payload: schemas.MetricIn, db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
     student = await crud.get_student(db, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return await crud.add_metric(db, student_id, payload)
+    metric = await crud.add_metric(db, student_id, payload)
+    await crud.log_action(db, current_user.id, "metric.create", "student", str(student_id))
+    return metric
+
+
+async def _read_items(request: Request) -> list:
+    """
+    The JSON values of a batch body: a JSON array, or NDJSON (one value per
+    line; unparseable lines come back as ValueError entries so they can be
+    reported in place). Content-Encoding: gzip is decoded with a size cap.
+    """
+    body = await request.body()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            raw = inflater.decompress(body, settings.metrics_batch_max_bytes + 1)
+        except zlib.error:
+            raise HTTPException(status_code=400, detail="Body is not valid gzip")
+        body = raw
+    if len(body) > settings.metrics_batch_max_bytes:
+        raise HTTPException(status_code=413, detail="Batch body too large")
+
+    if request.headers.get("content-type", "").split(";")[0].strip() in NDJSON_TYPES:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(ValueError(f"Invalid JSON: {e}"))
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of metrics")
+    if len(items) > settings.metrics_batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {settings.metrics_batch_max_items} metrics per batch")
+    return items
+
+
+def _validate(items: list) -> tuple[list, list]:
+    parsed, results = [], [None] * len(items)
+    for i, item in enumerate(items):
+        try:
+            if isinstance(item, Exception):
+                raise item
+            student_id, local_id, payload = metric_item(item)
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            results[i] = {"index": i, "status": "error", "error": item_error(e)}
+            continue
+        parsed.append((i, student_id, local_id, payload))
+    return parsed, results
+
+
+@router.post("/batch", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def add_metrics_batch(request: Request, db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    Upsert many metrics in one call. The body is a JSON array (or NDJSON with
+    Content-Type: application/x-ndjson, optionally gzip-encoded) of MetricIn
+    objects, each with a student_id or a local_student_id. Items are validated
+    and resolved together, the rules run column-wise, and each chunk of
+    METRIC_IMPORT_CHUNK_SIZE is written and committed as one transaction.
+    Results come back per item, in input order; when an item repeats an
+    earlier (student, as_of_date) the later one wins and the earlier is
+    reported as superseded, which clients should not retry.
+    """
+    items = await _read_items(request)
+    parsed, results = await run_in_threadpool(_validate, items)
+
+    local_ids = await crud.student_ids_by_local_id(db, {local_id for _, _, local_id, _ in parsed if local_id is not None})
+    known_ids = await crud.existing_student_ids(db, {student_id for _, student_id, _, _ in parsed if student_id is not None})
+    latest: dict[tuple, int] = {}
+    writes = []
+    for i, student_id, local_id, payload in parsed:
+        if local_id is not None:
+            student_id = local_ids.get(local_id)
+            if student_id is None:
+                results[i] = {"index": i, "status": "error", "error": f"Unknown local_student_id: {local_id}"}
+                continue
+        elif student_id not in known_ids:
+            results[i] = {"index": i, "status": "error", "error": f"Unknown student_id: {student_id}"}
+            continue
+        key = (student_id, payload.as_of_date)
+        if key in latest:
+            # Not a failure: a later item in this batch carries the value that is written.
+            results[latest[key]] = {"index": latest[key], "status": "superseded", "superseded_by": i}
+        latest[key] = i
+        writes.append((i, student_id, payload))
+    writes = [w for w in writes if latest[(w[1], w[2].as_of_date)] == w[0]]
+
+    for start in range(0, len(writes), METRIC_IMPORT_CHUNK_SIZE):
+        chunk = writes[start:start + METRIC_IMPORT_CHUNK_SIZE]
+        rows = crud.metric_rows([student_id for _, student_id, _ in chunk], [payload for _, _, payload in chunk])
+        created, _ = await crud.upsert_metric_keys(db, rows)
+        await db.commit()
+        for i, student_id, payload in chunk:
+            results[i] = {
+                "index": i,
+                "status": "created" if (student_id, payload.as_of_date) in created else "updated",
+                "student_id": student_id,
+                "as_of_date": payload.as_of_date,
+            }
+
+    counts = Counter(r["status"] for r in results)
+    await crud.log_action(db, current_user.id, "metric.batch")
+    return {
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "superseded": counts["superseded"],
+        "errors": counts["error"],
+        "results": results,
+    }
@@ -0,0 +1,35 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_db
+from app import crud
+from app.deps import require_roles
+from app.models import Role
+
+router = APIRouter(prefix="/rollups", tags=["rollups"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+
+@router.get("/risk", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def risk_rollups(
+    db: AsyncSession = Depends(get_db),
+    as_of_date: Optional[date] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    grade_level: Optional[int] = None,
+    diploma_path: Optional[str] = None,
+):
+    """Student counts by status and intervention, per as_of_date/grade_level/diploma_path, read from risk_rollups."""
+    rows = await crud.risk_rollups(
+        db, as_of_date=as_of_date, start=start, end=end, grade_level=grade_level, diploma_path=diploma_path
+    )
+    return [
+        {
+            "as_of_date": r.as_of_date,
+            "grade_level": r.grade_level,
+            "diploma_path": r.diploma_path or None,
+            "student_status": r.student_status,
+            "intervention_required": r.intervention_required,
+            "student_count": r.student_count,
+        }
+        for r in rows
+    ]
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app import snapshots
+from app.deps import require_roles
+from app.models import Role, StudentStatus
+
+router = APIRouter(prefix="/snapshots", tags=["snapshots"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+
+@router.get("/{snapshot_date}", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def status_snapshot(
+    snapshot_date: date,
+    format: Literal["csv", "ndjson"] = "ndjson",
+    student_status: Optional[StudentStatus] = None,
+    grade_level: Optional[int] = None,
+    diploma_path: Optional[str] = None,
+    intervention_required: Optional[bool] = None,
+):
+    """
+    Stream every student's latest metric with as_of_date <= snapshot_date, in roster order.
+    Dates before the current term are materialized on first use and served from that copy.
+    """
+    materialized = await snapshots.prepare(snapshot_date)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        snapshots.stream_snapshot(
+            format,
+            snapshot_date,
+            materialized,
+            student_status=student_status,
+            grade_level=grade_level,
+            diploma_path=diploma_path,
+            intervention_required=intervention_required,
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="snapshot-{snapshot_date.isoformat()}.{format}"',
+            "X-Snapshot-Materialized": "true" if materialized else "false",
+        },
+    )
@@ -1,34 +1,176 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_db
 from app import schemas, crud
 from app.deps import get_current_user, require_roles
-from app.models import Role
+from app.models import Role, StudentStatus
+from app.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/students", tags=["students"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
 
 @router.post("", response_model=schemas.StudentOut, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def create_student(payload: schemas.StudentCreate, db: AsyncSession = Depends(get_db)):
-    return await crud.create_student(db, payload)
+async def create_student(payload: schemas.StudentCreate, db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
+    student = await crud.create_student(db, payload)
+    await crud.log_action(db, current_user.id, "student.create", "student", str(student.id))
+    return student
 
-@router.get("", response_model=list[schemas.StudentOut], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def list_students(db: AsyncSession = Depends(get_db), limit: int = 100, offset: int = 0):
-    return await crud.list_students(db, limit=limit, offset=offset)
+class StudentUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    grade_level: Optional[int] = None
+    diploma_path: Optional[str] = None
 
-@router.get("/me", response_model=schemas.StudentWithLatest)
-async def my_student_record(user = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    if user.role != Role.student or user.student_id is None:
-        raise HTTPException(status_code=403, detail="Not a student account")
-    student = await crud.get_student(db, user.student_id)
+@router.patch("/{student_id}", response_model=schemas.StudentOut, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def update_student(student_id: int, payload: StudentUpdate, db: AsyncSession = Depends(get_db), current_user = Depends(get_current_user)):
+    # Only diploma_path can be cleared; a null for the other fields means "leave as is".
+    changes = {k: v for k, v in payload.model_dump(exclude_unset=True).items() if v is not None or k == "diploma_path"}
+    student = await crud.update_student(db, student_id, changes)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    latest = await crud.latest_metric_for_student(db, student.id)
-    return schemas.StudentWithLatest(student=student, latest_metric=latest)
+    await crud.log_action(db, current_user.id, "student.update", "student", str(student_id))
+    return student
+
+class StudentPage(BaseModel):
+    items: list[schemas.StudentOut]
+    next_cursor: Optional[str] = None
+
+def _cursor_key(cursor: Optional[str]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        last_name, first_name, student_id = decode_cursor(cursor, 3)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # The key is compared against (last_name, first_name, id) in SQL; reject mistyped parts here.
+    if not (isinstance(last_name, str) and isinstance(first_name, str) and type(student_id) is int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_name, first_name, student_id
+
+@router.get("", response_model=list[schemas.StudentOut] | StudentPage, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def list_students(
+    db: AsyncSession = Depends(get_db),
+    limit: int = 100,
+    offset: int = 0,
+    paginate: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+):
+    # Offset mode keeps the original bare-list response; cursor mode returns a page with next_cursor.
+    if paginate == "offset" and cursor is None:
+        return await crud.list_students(db, limit=limit, offset=offset)
+    students, next_key = await crud.list_students_after(db, limit=limit, after=_cursor_key(cursor))
+    return StudentPage(items=students, next_cursor=encode_cursor(next_key) if next_key else None)
+
+class RosterPage(BaseModel):
+    items: list[schemas.StudentWithLatest]
+    next_cursor: Optional[str] = None
+
+@router.get("/roster", response_model=RosterPage, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def roster(
+    db: AsyncSession = Depends(get_db),
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    student_status: Optional[StudentStatus] = None,
+    grade_level: Optional[int] = None,
+    diploma_path: Optional[str] = None,
+    intervention_required: Optional[bool] = None,
+):
+    """Students with their latest metric, fetched in a single query whatever the page size."""
+    rows, next_key = await crud.list_roster(
+        db,
+        limit=limit,
+        offset=offset,
+        after=_cursor_key(cursor),
+        student_status=student_status,
+        grade_level=grade_level,
+        diploma_path=diploma_path,
+        intervention_required=intervention_required,
+    )
+    return RosterPage(
+        items=[schemas.StudentWithLatest(student=student, latest_metric=latest) for student, latest in rows],
+        next_cursor=encode_cursor(next_key) if next_key else None,
+    )
+
+# Private (per-user) and always revalidated; the 304 path is the cheap one.
+DETAIL_CACHE_CONTROL = "private, no-cache"
+
+def _detail_etag(student_id: int, version) -> str:
+    raw = "|".join(str(v) for v in (student_id, *version)).encode()
+    return '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t.removeprefix("W/") for t in tags)
+
+async def _student_detail(request: Request, response: Response, db: AsyncSession, student_id: int):
+    """
+    StudentWithLatest with ETag/Cache-Control set, or a bare 304 when the
+    client's If-None-Match still matches; that check only reads version columns.
+    """
+    version = await crud.student_version(db, student_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    etag = _detail_etag(student_id, version)
+    headers = {"ETag": etag, "Cache-Control": DETAIL_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
-@router.get("/{student_id}", response_model=schemas.StudentWithLatest, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
-async def get_student(student_id: int, db: AsyncSession = Depends(get_db)):
     student = await crud.get_student(db, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     latest = await crud.latest_metric_for_student(db, student_id)
+    response.headers.update(headers)
     return schemas.StudentWithLatest(student=student, latest_metric=latest)
+
+@router.get("/me", response_model=schemas.StudentWithLatest)
+async def my_student_record(request: Request, response: Response, user = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    if user.role != Role.student or user.student_id is None:
+        raise HTTPException(status_code=403, detail="Not a student account")
+    return await _student_detail(request, response, db, user.student_id)
+
+async def _history(db: AsyncSession, student_id: int, bucket: str, start: Optional[date], end: Optional[date]) -> dict:
+    points = await crud.metric_history(db, student_id, bucket=bucket, start=start, end=end)
+    return {
+        "student_id": student_id,
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "points": points,
+        "trends": crud.history_trends(points),
+    }
+
+@router.get("/me/history")
+async def my_metric_history(
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    bucket: Literal["week", "month", "term"] = "month",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    if user.role != Role.student or user.student_id is None:
+        raise HTTPException(status_code=403, detail="Not a student account")
+    return await _history(db, user.student_id, bucket, start, end)
+
+@router.get("/{student_id}/history", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def metric_history(
+    student_id: int,
+    db: AsyncSession = Depends(get_db),
+    bucket: Literal["week", "month", "term"] = "month",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """Downsampled metric history with per-bucket first/last/avg attendance, credit pace and status transitions."""
+    student = await crud.get_student(db, student_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return await _history(db, student_id, bucket, start, end)
+
+@router.get("/{student_id}", response_model=schemas.StudentWithLatest, dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def get_student(student_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    return await _student_detail(request, response, db, student_id)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app import security
+from app.audit import audit_sink
+from app.db import engine, pool_metrics
+from app.deps import principal_cache, require_admin_or_internal
+from app.telemetry import render_prometheus
+
+router = APIRouter(tags=["telemetry"])
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse, dependencies=[Depends(require_admin_or_internal)])
+async def prometheus_metrics():
+    pool = pool_metrics.stats(engine)
+    return PlainTextResponse(
+        render_prometheus({
+            "db_pool": {**pool, "wait_seconds": pool_metrics.wait_seconds},
+            "password_hasher": security.hasher_pool.stats(),
+            "principal_cache": principal_cache.stats(),
+            "audit_sink": audit_sink.stats(),
+        }),
+        media_type="text/plain; version=0.0.4",
+    )
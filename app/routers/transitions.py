@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_db
+from app import crud
+from app.deps import require_roles
+from app.models import Role, StudentStatus
+from app.pagination import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/transitions", tags=["transitions"], dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+
+def _cursor_key(cursor: Optional[str]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        as_of_date, transition_id = decode_cursor(cursor, 2)
+        return date.fromisoformat(as_of_date), int(transition_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("", dependencies=[Depends(require_roles(Role.admin, Role.counselor))])
+async def list_transitions(
+    start: date,
+    end: date,
+    db: AsyncSession = Depends(get_db),
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    from_status: Optional[StudentStatus] = None,
+    to_status: Optional[StudentStatus] = None,
+    to_intervention: Optional[bool] = None,
+    grade_level: Optional[int] = None,
+    diploma_path: Optional[str] = None,
+):
+    """Status / intervention changes dated in [start, end], read from student_status_transitions only."""
+    rows, next_key = await crud.list_transitions(
+        db,
+        start=start,
+        end=end,
+        limit=limit,
+        after=_cursor_key(cursor),
+        from_status=from_status,
+        to_status=to_status,
+        to_intervention=to_intervention,
+        grade_level=grade_level,
+        diploma_path=diploma_path,
+    )
+    return {
+        "items": [
+            {
+                "student_id": t.student_id,
+                "local_student_id": s.local_student_id,
+                "first_name": s.first_name,
+                "last_name": s.last_name,
+                "grade_level": s.grade_level,
+                "as_of_date": t.as_of_date,
+                "from_status": t.from_status,
+                "to_status": t.to_status,
+                "from_intervention": t.from_intervention,
+                "to_intervention": t.to_intervention,
+            }
+            for t, s in rows
+        ],
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    }
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from argon2 import PasswordHasher
@@ -22,6 +25,65 @@ def verify_password(password: str, hashed: str) -> bool:
         return False
 
 
+class PasswordHasherPool:
+    """
+    Runs argon2 hash/verify off the event loop on a bounded thread pool.
+    argon2-cffi releases the GIL while hashing, so the threads run in parallel.
+    Callers beyond max_workers wait on a semaphore; that wait is the queue depth.
+    max_workers <= 0 hashes inline on the event loop (the old behaviour).
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="argon2") if max_workers > 0 else None
+        self._slots = asyncio.Semaphore(max(max_workers, 1))
+        self._waiting = 0
+        self._active = 0
+        self._max_waiting = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+
+    async def run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._wait_seconds += time.perf_counter() - queued_at
+        self._active += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "active": self._active,
+            "queue_depth": self._waiting,
+            "max_queue_depth": self._max_waiting,
+            "completed": self._completed,
+            "avg_wait_ms": round(self._wait_seconds * 1000 / self._completed, 3) if self._completed else 0.0,
+        }
+
+
+hasher_pool = PasswordHasherPool(settings.password_hash_workers)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hasher_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await hasher_pool.run(verify_password, password, hashed)
+
+
 def create_access_token(subject: str, role: Role) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expires_minutes)
     payload = {"sub": subject, "role": role.value, "exp": expire}
@@ -0,0 +1,131 @@
+"""
+Point-in-time district snapshots: every student's latest metric with
+as_of_date <= D, as it stood on D.
+
+The live query is one statement: students joined LATERAL to their newest
+metric on or before D, which is an index probe on
+ix_student_metrics_student_id_as_of_date per student. Dates before the start
+of the current term are closed and cannot change except by a backdated
+write, so the first request for a closed date materializes it into
+status_snapshot_rows; crud.invalidate_snapshots drops it again when a
+metric dated on or before it is written.
+"""
+from datetime import date
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import insert, literal, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import export
+from app.crud import FALL_TERM_START_MONTH, METRIC_RESULT_COLUMNS, STUDENT_ORDER
+from app.db import AsyncSessionLocal
+from app.models import StatusSnapshot, StatusSnapshotRow, Student, StudentMetric, StudentStatus
+
+SNAPSHOT_COLUMNS = ("metric_id", "as_of_date") + METRIC_RESULT_COLUMNS
+OUTPUT_COLUMNS = ("student_id", "local_student_id", "first_name", "last_name", "grade_level", "diploma_path") + SNAPSHOT_COLUMNS
+
+
+def term_start(d: date) -> date:
+    # Terms are semesters, as in crud.metric_history: fall from August, spring from January.
+    return date(d.year, FALL_TERM_START_MONTH if d.month >= FALL_TERM_START_MONTH else 1, 1)
+
+
+def is_closed(snapshot_date: date, today: Optional[date] = None) -> bool:
+    return snapshot_date < term_start(today or date.today())
+
+
+def live_snapshot(snapshot_date: date):
+    """(student_id, metric_id, as_of_date, result columns) per student with a metric on or before snapshot_date."""
+    latest = (
+        select(StudentMetric.id.label("metric_id"), StudentMetric.as_of_date, *(getattr(StudentMetric, c) for c in METRIC_RESULT_COLUMNS))
+        .where(StudentMetric.student_id == Student.id, StudentMetric.as_of_date <= snapshot_date)
+        .order_by(StudentMetric.as_of_date.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    return select(Student.id.label("student_id"), *(latest.c[c] for c in SNAPSHOT_COLUMNS)).join(latest, true())
+
+
+async def materialize(db: AsyncSession, snapshot_date: date) -> bool:
+    """
+    Store the snapshot for snapshot_date unless it already is. Returns True if
+    this call built it. Caller commits; a concurrent build of the same date
+    waits on the status_snapshots key and then finds it done.
+    """
+    claimed = await db.execute(
+        pg_insert(StatusSnapshot)
+        .values(snapshot_date=snapshot_date, student_count=0)
+        .on_conflict_do_nothing(index_elements=["snapshot_date"])
+        .returning(StatusSnapshot.snapshot_date)
+    )
+    if claimed.first() is None:
+        return False
+    live = live_snapshot(snapshot_date).subquery()
+    res = await db.execute(
+        insert(StatusSnapshotRow).from_select(
+            ["snapshot_date", "student_id", *SNAPSHOT_COLUMNS],
+            select(literal(snapshot_date), live.c.student_id, *(live.c[c] for c in SNAPSHOT_COLUMNS)),
+        )
+    )
+    await db.execute(
+        update(StatusSnapshot)
+        .where(StatusSnapshot.snapshot_date == snapshot_date)
+        .values(student_count=res.rowcount)
+    )
+    return True
+
+
+def snapshot_query(
+    snapshot_date: date,
+    materialized: bool,
+    student_status: StudentStatus | None = None,
+    grade_level: int | None = None,
+    diploma_path: str | None = None,
+    intervention_required: bool | None = None,
+):
+    """OUTPUT_COLUMNS rows in roster order, with the roster filters."""
+    if materialized:
+        source = (
+            select(StatusSnapshotRow.student_id, *(getattr(StatusSnapshotRow, c) for c in SNAPSHOT_COLUMNS))
+            .where(StatusSnapshotRow.snapshot_date == snapshot_date)
+            .subquery()
+        )
+    else:
+        source = live_snapshot(snapshot_date).subquery()
+    stmt = (
+        select(
+            Student.id,
+            Student.local_student_id,
+            Student.first_name,
+            Student.last_name,
+            Student.grade_level,
+            Student.diploma_path,
+            *(source.c[c] for c in SNAPSHOT_COLUMNS),
+        )
+        .join(source, source.c.student_id == Student.id)
+        .order_by(*STUDENT_ORDER)
+    )
+    if student_status is not None:
+        stmt = stmt.where(source.c.student_status == student_status)
+    if grade_level is not None:
+        stmt = stmt.where(Student.grade_level == grade_level)
+    if diploma_path is not None:
+        stmt = stmt.where(Student.diploma_path == diploma_path)
+    if intervention_required is not None:
+        stmt = stmt.where(source.c.intervention_required == intervention_required)
+    return stmt
+
+
+async def prepare(snapshot_date: date) -> bool:
+    """Materialize closed dates before streaming. Returns whether the stream reads the materialized rows."""
+    if not is_closed(snapshot_date):
+        return False
+    async with AsyncSessionLocal() as db:
+        await materialize(db, snapshot_date)
+        await db.commit()
+    return True
+
+
+def stream_snapshot(fmt: str, snapshot_date: date, materialized: bool, **filters) -> AsyncIterator[str]:
+    return export.stream_rows(snapshot_query(snapshot_date, materialized, **filters), OUTPUT_COLUMNS, fmt)
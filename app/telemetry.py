@@ -0,0 +1,214 @@
+"""
+In-process metrics with no external client library: histograms, per-route
+request/DB metrics (ASGI middleware + SQLAlchemy cursor hooks) and a
+Prometheus text renderer.
+"""
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+
+# Seconds; tuned for request and pool-wait latencies.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket (not cumulative) plus +Inf."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation (None when empty or in +Inf)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50_le": self.quantile(0.5),
+            "p99_le": self.quantile(0.99),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Per-request metrics: ASGI middleware + SQLAlchemy cursor hooks.
+
+log = logging.getLogger("app.slow_requests")
+
+MAX_CAPTURED_STATEMENTS = 50
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: list = field(default_factory=list)
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+
+@dataclass
+class RouteStats:
+    statuses: Counter = field(default_factory=Counter)
+    latency: Histogram = field(default_factory=Histogram)
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.queries_outside_requests = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        route_stats = self.routes.get((method, route))
+        if route_stats is None:
+            route_stats = self.routes[(method, route)] = RouteStats()
+        route_stats.statuses[status] += 1
+        route_stats.latency.observe(seconds)
+        route_stats.queries += stats.queries
+        route_stats.db_seconds += stats.db_seconds
+
+
+request_metrics = RequestMetrics()
+
+
+def install_query_hooks(engine) -> None:
+    """Attribute every cursor execution on `engine` to the request in current_request."""
+    sync_engine = engine.sync_engine
+
+    # The start time lives on the execution context, not the connection: a statement that
+    # fails never reaches after_cursor_execute, and nothing may be left behind on a pooled connection.
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        stats = current_request.get()
+        if stats is None:
+            request_metrics.queries_outside_requests += 1
+            return
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if len(stats.statements) < MAX_CAPTURED_STATEMENTS:
+            stats.statements.append((round(elapsed * 1000, 3), statement[:500]))
+
+
+class TelemetryMiddleware:
+    """
+    Records latency, status and DB usage per route template, and logs the
+    statements of any request slower than slow_request_seconds.
+    """
+
+    def __init__(self, app, slow_request_seconds: float):
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            # FastAPI leaves the matched APIRoute in the scope; use its template, not the raw path.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            request_metrics.record(scope["method"], route, status, elapsed, stats)
+            if elapsed >= self.slow_request_seconds:
+                log.warning(
+                    "slow request %s %s %s: %.1f ms, %s queries, %.1f ms in DB\n%s",
+                    scope["method"], route, status, elapsed * 1000, stats.queries, stats.db_seconds * 1000,
+                    "\n".join(f"  [{ms} ms] {sql}" for ms, sql in stats.statements),
+                )
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text exposition.
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels.items())
+    return "{" + inner + "}" if inner else ""
+
+
+def _histogram_lines(name: str, hist: Histogram, **labels) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, n in zip(hist.buckets, hist.counts):
+        cumulative += n
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def render_prometheus(components: dict[str, dict]) -> str:
+    """Request metrics plus every numeric value in `components` (name -> stats dict) as gauges."""
+    lines = [
+        "# TYPE http_requests_total counter",
+        "# TYPE http_request_duration_seconds histogram",
+        "# TYPE db_queries_total counter",
+        "# TYPE db_query_seconds_total counter",
+    ]
+    for (method, route), stats in sorted(request_metrics.routes.items()):
+        for status, n in sorted(stats.statuses.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+        lines.extend(_histogram_lines("http_request_duration_seconds", stats.latency, method=method, route=route))
+        lines.append(f"db_queries_total{_labels(method=method, route=route)} {stats.queries}")
+        lines.append(f"db_query_seconds_total{_labels(method=method, route=route)} {round(stats.db_seconds, 6)}")
+    lines.append(f"db_queries_outside_requests_total {request_metrics.queries_outside_requests}")
+
+    for component, stats in components.items():
+        for key, value in stats.items():
+            if isinstance(value, Histogram):
+                lines.extend(_histogram_lines(f"app_{component}_{key}", value))
+            elif isinstance(value, bool):
+                lines.append(f"app_{component}_{key} {int(value)}")
+            elif isinstance(value, (int, float)):
+                lines.append(f"app_{component}_{key} {value}")
+    return "\n".join(lines) + "\n"
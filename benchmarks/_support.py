@@ -0,0 +1,72 @@
+"""
+Shared helpers for the benchmarks that drive the real FastAPI app in-process.
+
+They run against settings.database_url and DROP/CREATE the schema there,
+so point DATABASE_URL at a scratch database.
+"""
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app import crud, schemas
+from app.db import AsyncSessionLocal, Base, engine
+from app import models  # noqa: F401 (register metadata)
+from app.models import Role
+
+ADMIN_EMAIL = "bench-admin@example.org"
+ADMIN_PASSWORD = "bench-password"
+
+
+async def reset_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def create_admin() -> None:
+    async with AsyncSessionLocal() as db:
+        await crud.create_user(db, schemas.UserCreate(email=ADMIN_EMAIL, password=ADMIN_PASSWORD, role=Role.admin))
+
+
+@asynccontextmanager
+async def app_client():
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        yield client
+
+
+async def login(client: httpx.AsyncClient, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> dict:
+    res = await client.post("/auth/token", data={"username": email, "password": password})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+async def timed(call) -> float:
+    started = time.perf_counter()
+    res = await call()
+    elapsed = time.perf_counter() - started
+    if res.status_code >= 500:
+        raise RuntimeError(f"{res.request.url} -> {res.status_code}")
+    return elapsed
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
@@ -0,0 +1,52 @@
+"""
+Authenticated request throughput with the principal cache on and off.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.auth_cache --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app import deps
+from benchmarks._support import app_client, create_admin, login, reset_schema, summarize, timed
+
+
+async def run_phase(client, headers, cache_size: int, requests: int, concurrency: int) -> dict:
+    deps.principal_cache.max_entries = cache_size
+    deps.principal_cache.clear()
+    deps.principal_cache.hits = deps.principal_cache.misses = 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            return await timed(lambda: client.get("/students", params={"limit": 1}, headers=headers))
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "cache": "on" if cache_size > 0 else "off",
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency": summarize(list(latencies)),
+        "cache_stats": deps.principal_cache.stats(),
+    }
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await create_admin()
+    async with app_client() as client:
+        headers = await login(client)
+        results = [
+            await run_phase(client, headers, 0, args.requests, args.concurrency),
+            await run_phase(client, headers, 10000, args.requests, args.concurrency),
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
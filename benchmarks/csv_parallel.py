@@ -0,0 +1,102 @@
+"""
+Metrics CSV parse/validate throughput: the per-row path (metric_inputs +
+schemas.MetricIn on one core) vs app.csv_parallel on 1, 2, 4 and 8 worker
+processes. No database needed.
+
+    python -m benchmarks.csv_parallel --rows 1000000 --workers 1 2 4 8
+
+Each pool parses the file once untimed so process start-up is not counted.
+The timed run is the import's parse stage (iter_parsed_ranges) with the
+writes left out; first_range_seconds is when the import could start writing.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from app.csv_parallel import iter_parsed_ranges
+from app.importers import metric_in, metric_inputs
+from app.models import GrowthStatus
+
+COLUMNS = ["local_student_id", "as_of_date", "attendance_percentage", "growth_status", "credits_earned", "expected_credits_for_grade"]
+
+
+def write_csv(path: str, rows: int, bad_every: int) -> None:
+    rng = random.Random(17)
+    start = date(2025, 8, 4)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            writer.writerow([
+                f"S{i // 40:06d}",
+                (start + timedelta(weeks=i % 40)).isoformat(),
+                "not-a-number" if bad_every and i % bad_every == 0 else f"{rng.uniform(80, 100):.1f}",
+                rng.choice(list(GrowthStatus)).value,
+                rng.randint(0, 24),
+                rng.randint(0, 24),
+            ])
+
+
+def per_row(path: str) -> tuple[int, int]:
+    ok = bad = 0
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                metric_in(row, metric_inputs(row))
+                ok += 1
+            except (KeyError, ValueError, TypeError, AttributeError):
+                bad += 1
+    return ok, bad
+
+
+async def main(args) -> None:
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_csv(path, args.rows, args.bad_every)
+        results = {}
+
+        started = time.perf_counter()
+        ok, bad = per_row(path)
+        elapsed = time.perf_counter() - started
+        results["per_row"] = {"seconds": round(elapsed, 3), "rows_per_second": round(args.rows / elapsed), "rows": ok, "errors": bad}
+
+        for workers in args.workers:
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                async for _ in iter_parsed_ranges(path, pool, workers):
+                    pass
+                started = time.perf_counter()
+                first_range = None
+                parsed = errors = 0
+                async for result in iter_parsed_ranges(path, pool, workers):
+                    if first_range is None:
+                        first_range = time.perf_counter() - started
+                    parsed += len(result.batch)
+                    errors += result.error_count
+                elapsed = time.perf_counter() - started
+            assert parsed == ok and errors == bad, "parallel stage disagrees with the per-row path"
+            results[f"workers_{workers}"] = {
+                "seconds": round(elapsed, 3),
+                "first_range_seconds": round(first_range, 3),
+                "rows_per_second": round(args.rows / elapsed),
+                "speedup_vs_per_row": round(results["per_row"]["seconds"] / elapsed, 2),
+            }
+        print(json.dumps({"rows": args.rows, "cpu_count": os.cpu_count(), **results}, indent=2))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bad-every", type=int, default=10_000, help="make every Nth row invalid (0 = none)")
+    asyncio.run(main(parser.parse_args()))
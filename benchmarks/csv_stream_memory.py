@@ -0,0 +1,116 @@
+"""
+Peak RSS of parsing a synthetic metrics CSV: whole-file read vs iter_csv_chunks
+vs the metrics import's parallel parse (app.csv_parallel.iter_parsed_ranges on
+two worker processes; the peak is the larger of the parent and any worker).
+
+    python -m benchmarks.csv_stream_memory --sizes-mb 50 200
+
+Each measurement runs in a fresh subprocess so ru_maxrss is not shared.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HEADER = "local_student_id,as_of_date,attendance_percentage,growth_status,credits_earned,expected_credits_for_grade\n"
+
+
+def write_synthetic(path: str, size_mb: int) -> int:
+    rows = 0
+    target = size_mb * 1024 * 1024
+    with open(path, "w", newline="") as f:
+        f.write(HEADER)
+        while f.tell() < target:
+            f.write(f"S{rows % 50000:06d},2026-01-{rows % 28 + 1:02d},{90 + rows % 10}.5,MEETS,{rows % 24},12\n")
+            rows += 1
+    return rows
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_read_all(path: str) -> int:
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8-sig")
+    return sum(1 for _ in csv.DictReader(io.StringIO(text)))
+
+
+def run_stream(path: str) -> int:
+    from starlette.datastructures import UploadFile
+    from app.csv_stream import iter_csv_chunks
+
+    async def consume() -> int:
+        with open(path, "rb") as f:
+            n = 0
+            async for chunk in iter_csv_chunks(UploadFile(file=f), 1000):
+                n += len(chunk)
+            return n
+
+    return asyncio.run(consume())
+
+
+def run_ranges(path: str) -> int:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from app.csv_parallel import iter_parsed_ranges
+
+    async def consume(pool) -> int:
+        n = 0
+        async for parsed in iter_parsed_ranges(path, pool, 2):
+            n += len(parsed.batch) + parsed.error_count
+        return n
+
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return asyncio.run(consume(pool))
+
+
+def child(mode: str, path: str) -> None:
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    rows = {"stream": run_stream, "ranges": run_ranges, "read_all": run_read_all}[mode](path)
+    workers_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(time.perf_counter() - started, 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(max(peak_rss_mb(), workers_peak), 1),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[25, 100, 200])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(tmp, f"metrics_{size_mb}mb.csv")
+            write_synthetic(path, size_mb)
+            for mode in ("read_all", "stream", "ranges"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.csv_stream_memory", "--child", mode, path],
+                    check=True, capture_output=True, text=True,
+                )
+                results.append({"file_mb": size_mb, **json.loads(out.stdout)})
+            os.remove(path)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Student portal polling GET /students/me: full responses vs conditional
+requests that come back 304 Not Modified.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.etag_poll --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+from app import crud, schemas
+from app.db import AsyncSessionLocal
+from app.models import GrowthStatus, Role
+from benchmarks._support import app_client, login, reset_schema, summarize
+
+STUDENT_EMAIL = "bench-student@example.org"
+STUDENT_PASSWORD = "bench-password"
+
+
+async def seed(weeks: int) -> None:
+    async with AsyncSessionLocal() as db:
+        student = await crud.create_student(db, schemas.StudentCreate(
+            local_student_id="S000001", first_name="Avery", last_name="Lee", grade_level=11, diploma_path="Standard",
+        ))
+        start = date(2025, 8, 4)
+        for w in range(weeks):
+            await crud.add_metric(db, student.id, schemas.MetricIn(
+                as_of_date=start + timedelta(weeks=w),
+                attendance_percentage=92.5,
+                growth_status=GrowthStatus.meets,
+                credits_earned=w // 4,
+                expected_credits_for_grade=w // 4,
+            ))
+        await crud.create_user(db, schemas.UserCreate(
+            email=STUDENT_EMAIL, password=STUDENT_PASSWORD, role=Role.student, student_id=student.id,
+        ))
+
+
+async def run_phase(client, headers, requests: int, concurrency: int) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def one():
+        async with gate:
+            started = time.perf_counter()
+            res = await client.get("/students/me", headers=headers)
+            statuses.append(res.status_code)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency": summarize(list(latencies)),
+        "status_codes": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+    }
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await seed(args.weeks)
+    async with app_client() as client:
+        headers = await login(client, STUDENT_EMAIL, STUDENT_PASSWORD)
+        first = await client.get("/students/me", headers=headers)
+        conditional = {**headers, "If-None-Match": first.headers["ETag"]}
+        results = {
+            "full": await run_phase(client, headers, args.requests, args.concurrency),
+            "if_none_match": await run_phase(client, conditional, args.requests, args.concurrency),
+        }
+    print(json.dumps({"etag": first.headers["ETag"], **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--weeks", type=int, default=40, help="metrics history for the polled student")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,303 @@
+"""
+Reproducible end-to-end benchmark of the API against a synthetic district.
+
+    # throwaway local Postgres (needs initdb/pg_ctl on PATH; no network)
+    python -m benchmarks.harness --scale small --ephemeral-postgres --output bench-small.json
+
+    # an existing scratch database (its schema is dropped and recreated)
+    python -m benchmarks.harness --scale medium --database-url postgresql+asyncpg://.../bench
+
+    # diff two result files
+    python -m benchmarks.harness --compare old.json new.json
+
+The app is driven in-process through httpx.ASGITransport, so no server or
+network is involved. The write paths rely on Postgres features (ON CONFLICT,
+DISTINCT ON, array parameters), so SQLite cannot stand in; --ephemeral-postgres
+is the offline option. It runs with fsync=off, which the results record.
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+SCALES = {"small": 1_000, "medium": 50_000, "large": 500_000}
+GROWTH = ("EXCEEDS", "MEETS", "BELOW", "NO_DATA")
+FIRST_WEEK = date(2025, 8, 4)
+
+
+# ---------------------------------------------------------------------------
+# Local database stand-in
+
+def _pg_binary(name: str) -> str:
+    found = shutil.which(name) or next(iter(sorted(glob.glob(f"/usr/lib/postgresql/*/bin/{name}"), reverse=True)), None)
+    if not found:
+        raise SystemExit(f"{name} not found; install PostgreSQL server binaries or pass --database-url")
+    return found
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def ephemeral_postgres():
+    tmp = tempfile.mkdtemp(prefix="bench-pg-")
+    data = os.path.join(tmp, "data")
+    port = _free_port()
+    pg_ctl = _pg_binary("pg_ctl")
+    subprocess.run(
+        [_pg_binary("initdb"), "-D", data, "-U", "postgres", "--auth=trust", "-E", "UTF8"],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    options = f"-p {port} -k {tmp} -c listen_addresses=127.0.0.1 -c fsync=off -c synchronous_commit=off"
+    subprocess.run(
+        [pg_ctl, "-D", data, "-o", options, "-l", os.path.join(tmp, "postgres.log"), "-w", "start"],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    try:
+        yield f"postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, "-D", data, "-m", "fast", "-w", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic district
+
+def student_rows(start: int, count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "local_student_id": f"S{i:07d}",
+            "first_name": rng.choice(("Avery", "Jordan", "Sam", "Riley", "Kai", "Quinn")),
+            "last_name": f"L{rng.randrange(count // 3 + 1):05d}",
+            "grade_level": 9 + i % 4,
+            "diploma_path": rng.choice(("Core 40", "Honors", None)),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def metric_inputs(rng: random.Random, week: int) -> dict:
+    return {
+        "as_of_date": FIRST_WEEK + timedelta(weeks=week),
+        "attendance_percentage": round(rng.uniform(80, 100), 1) if rng.random() > 0.05 else None,
+        "growth_status": rng.choice(GROWTH),
+        "credits_earned": week // 4 + rng.randint(-1, 1),
+        "expected_credits_for_grade": week // 4,
+    }
+
+
+async def seed_district(students: int, weeks: int, seed: int) -> list[int]:
+    from sqlalchemy import insert, select
+    from app import crud, models, schemas
+    from app.db import AsyncSessionLocal
+
+    rng = random.Random(seed)
+    async with AsyncSessionLocal() as db:
+        for start in range(0, students, 5000):
+            await db.execute(insert(models.Student), student_rows(start, min(5000, students - start), rng))
+        await db.commit()
+        ids = (await db.execute(select(models.Student.id).order_by(models.Student.id))).scalars().all()
+
+        batch_ids, batch_payloads = [], []
+        for student_id in ids:
+            for week in range(weeks):
+                batch_ids.append(student_id)
+                batch_payloads.append(schemas.MetricIn(**metric_inputs(rng, week)))
+            if len(batch_ids) >= 20_000:
+                await db.execute(insert(models.StudentMetric), crud.metric_rows(batch_ids, batch_payloads))
+                await db.commit()
+                batch_ids, batch_payloads = [], []
+        if batch_ids:
+            await db.execute(insert(models.StudentMetric), crud.metric_rows(batch_ids, batch_payloads))
+        await crud.rebuild_current_status(db)
+        await crud.rebuild_risk_rollups(db)
+        await db.commit()
+    return list(ids)
+
+
+def students_csv(start: int, count: int, rng: random.Random) -> bytes:
+    lines = ["local_student_id,first_name,last_name,grade_level,diploma_path"]
+    lines += [
+        f"{r['local_student_id']},{r['first_name']},{r['last_name']},{r['grade_level']},{r['diploma_path'] or ''}"
+        for r in student_rows(start, count, rng)
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def metrics_csv(local_ids: list[str], week: int, rng: random.Random) -> bytes:
+    lines = ["local_student_id,as_of_date,attendance_percentage,growth_status,credits_earned,expected_credits_for_grade"]
+    for local_id in local_ids:
+        m = metric_inputs(rng, week)
+        lines.append(
+            f"{local_id},{m['as_of_date'].isoformat()},{m['attendance_percentage'] if m['attendance_percentage'] is not None else ''},"
+            f"{m['growth_status']},{m['credits_earned']},{m['expected_credits_for_grade']}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+
+async def measure(name: str, make_call, requests: int, concurrency: int) -> dict:
+    from benchmarks._support import summarize, timed
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with gate:
+            return await timed(lambda: make_call(i))
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {"scenario": name, "concurrency": concurrency, "requests_per_second": round(requests / elapsed, 1), **summarize(list(latencies))}
+
+
+async def run_scenarios(args, student_ids: list[int]) -> list[dict]:
+    from benchmarks._support import ADMIN_EMAIL, ADMIN_PASSWORD, app_client, login
+
+    rng = random.Random(args.seed + 1)
+    results = []
+    async with app_client() as client:
+        headers = await login(client)
+        n, c = args.requests, args.concurrency
+
+        results.append(await measure(
+            "auth_token",
+            lambda i: client.post("/auth/token", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}),
+            max(1, n // 10), c,
+        ))
+        results.append(await measure(
+            "students_list",
+            lambda i: client.get("/students", params={"limit": 100, "offset": rng.randrange(max(1, len(student_ids) - 100))}, headers=headers),
+            n, c,
+        ))
+        results.append(await measure(
+            "student_detail",
+            lambda i: client.get(f"/students/{rng.choice(student_ids)}", headers=headers),
+            n, c,
+        ))
+        # One new as_of_date per request so every call inserts.
+        post_week = args.weeks + 1
+
+        def post_metric(i: int):
+            body = metric_inputs(rng, post_week)
+            body["as_of_date"] = (body["as_of_date"] + timedelta(days=i // len(student_ids))).isoformat()
+            return client.post(f"/metrics/students/{student_ids[i % len(student_ids)]}", json=body, headers=headers)
+
+        results.append(await measure("metrics_post", post_metric, n, c))
+
+        for name, path, payload, rows in (
+            ("students_csv_import", "/imports/students_csv",
+             students_csv(len(student_ids), args.import_rows, rng), args.import_rows),
+            ("metrics_csv_import", "/imports/metrics_csv",
+             metrics_csv([f"S{i:07d}" for i in range(min(args.import_rows, len(student_ids)))], post_week + 10, rng),
+             min(args.import_rows, len(student_ids))),
+        ):
+            started = time.perf_counter()
+            res = await client.post(path, files={"file": ("bench.csv", payload, "text/csv")}, headers=headers)
+            elapsed = time.perf_counter() - started
+            res.raise_for_status()
+            results.append({"scenario": name, "rows": rows, "seconds": round(elapsed, 3),
+                            "rows_per_second": round(rows / elapsed, 1), "response": res.json()})
+    return results
+
+
+async def run(args, database_url: str) -> dict:
+    os.environ["DATABASE_URL"] = database_url
+    from benchmarks._support import create_admin, reset_schema
+
+    students = SCALES[args.scale] if args.students is None else args.students
+    await reset_schema()
+    await create_admin()
+    started = time.perf_counter()
+    student_ids = await seed_district(students, args.weeks, args.seed)
+    seed_seconds = time.perf_counter() - started
+    scenarios = await run_scenarios(args, student_ids)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": "ephemeral-postgres (fsync=off)" if args.ephemeral_postgres else "external",
+            "scale": args.scale,
+            "students": students,
+            "weeks": args.weeks,
+            "seed": args.seed,
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as f:
+        old = {s["scenario"]: s for s in json.load(f)["scenarios"]}
+    with open(new_path) as f:
+        new = {s["scenario"]: s for s in json.load(f)["scenarios"]}
+    for name in sorted(old.keys() | new.keys()):
+        a, b = old.get(name, {}), new.get(name, {})
+        for key in ("requests_per_second", "rows_per_second", "p50_ms", "p95_ms", "p99_ms"):
+            if key in a and key in b and a[key]:
+                print(f"{name:22} {key:20} {a[key]:>12} -> {b[key]:>12} ({(b[key] - a[key]) / a[key]:+.1%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--students", type=int, help="override the scale's student count")
+    parser.add_argument("--weeks", type=int, default=12, help="weekly metrics per student")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--import-rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url")
+    parser.add_argument("--ephemeral-postgres", action="store_true")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.ephemeral_postgres == bool(args.database_url):
+        parser.error("pass exactly one of --database-url or --ephemeral-postgres")
+
+    if args.ephemeral_postgres:
+        with ephemeral_postgres() as url:
+            result = asyncio.run(run(args, url))
+    else:
+        result = asyncio.run(run(args, args.database_url))
+
+    text = json.dumps(result, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
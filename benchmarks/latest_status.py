@@ -0,0 +1,83 @@
+"""
+Latest-status read latency with 5 years of weekly metrics per student:
+ORDER BY as_of_date DESC LIMIT 1 over student_metrics vs the student_current_status projection.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.latest_status --students 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import desc, insert, select
+
+from app import crud, models, schemas
+from app.db import AsyncSessionLocal
+from app.models import GrowthStatus
+from benchmarks._support import reset_schema, summarize
+
+WEEKS = 52 * 5
+
+
+async def seed(students: int) -> None:
+    rng = random.Random(3)
+    start = date(2021, 8, 2)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(models.Student), [
+            {"local_student_id": f"S{i:06d}", "first_name": "F", "last_name": f"L{i}", "grade_level": 9 + i % 4}
+            for i in range(students)
+        ])
+        ids = (await db.execute(select(models.Student.id))).scalars().all()
+        for student_id in ids:
+            payloads = [
+                schemas.MetricIn(
+                    as_of_date=start + timedelta(weeks=w),
+                    attendance_percentage=round(rng.uniform(85, 100), 1),
+                    growth_status=rng.choice(list(GrowthStatus)),
+                    credits_earned=w // 10,
+                    expected_credits_for_grade=w // 10 + rng.randint(-1, 1),
+                )
+                for w in range(WEEKS)
+            ]
+            await db.execute(insert(models.StudentMetric), crud.metric_rows([student_id] * WEEKS, payloads))
+        await crud.rebuild_current_status(db)
+        await db.commit()
+
+
+async def legacy_latest(db, student_id: int):
+    res = await db.execute(
+        select(models.StudentMetric)
+        .where(models.StudentMetric.student_id == student_id)
+        .order_by(desc(models.StudentMetric.as_of_date))
+        .limit(1)
+    )
+    return res.scalar_one_or_none()
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await seed(args.students)
+    async with AsyncSessionLocal() as db:
+        ids = (await db.execute(select(models.Student.id))).scalars().all()
+    sample = random.Random(5).choices(ids, k=args.reads)
+
+    results = {}
+    for name, fn in (("order_by_limit_1", legacy_latest), ("projection", crud.latest_metric_for_student)):
+        latencies = []
+        async with AsyncSessionLocal() as db:
+            for student_id in sample:
+                started = time.perf_counter()
+                await fn(db, student_id)
+                latencies.append(time.perf_counter() - started)
+                db.expunge_all()
+        results[name] = summarize(latencies)
+    print(json.dumps({"students": args.students, "metrics_per_student": WEEKS, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+"""
+p99 of /health and /students/{id} while a burst of /auth/token calls is in flight,
+with argon2 inline on the event loop ("before") and on the hasher pool ("after").
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.login_burst --logins 200
+"""
+import argparse
+import asyncio
+import json
+
+from app import schemas, security
+from app.db import AsyncSessionLocal
+from app import crud
+from benchmarks._support import app_client, create_admin, login, reset_schema, summarize, timed, ADMIN_EMAIL, ADMIN_PASSWORD
+
+
+async def probe(client, headers, student_id: int, stop: asyncio.Event, health: list, detail: list) -> None:
+    while not stop.is_set():
+        health.append(await timed(lambda: client.get("/health")))
+        detail.append(await timed(lambda: client.get(f"/students/{student_id}", headers=headers)))
+
+
+async def run_phase(client, headers, student_id: int, workers: int, logins: int, concurrency: int) -> dict:
+    security.hasher_pool = security.PasswordHasherPool(workers)
+    health, detail = [], []
+    stop = asyncio.Event()
+    probes = [asyncio.create_task(probe(client, headers, student_id, stop, health, detail)) for _ in range(4)]
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one_login():
+        async with gate:
+            return await timed(lambda: client.post("/auth/token", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}))
+
+    token_latencies = await asyncio.gather(*(one_login() for _ in range(logins)))
+    stop.set()
+    await asyncio.gather(*probes)
+    return {
+        "hash_workers": workers,
+        "auth_token": summarize(list(token_latencies)),
+        "health": summarize(health),
+        "student_detail": summarize(detail),
+        "hasher": security.hasher_pool.stats(),
+    }
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await create_admin()
+    async with AsyncSessionLocal() as db:
+        student = await crud.create_student(db, schemas.StudentCreate(
+            local_student_id="B0001", first_name="Bench", last_name="Student", grade_level=10, diploma_path=None,
+        ))
+    async with app_client() as client:
+        headers = await login(client)
+        results = [
+            await run_phase(client, headers, student.id, 0, args.logins, args.concurrency),
+            await run_phase(client, headers, student.id, args.workers, args.logins, args.concurrency),
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Insert and current-school-year query cost as student_metrics history grows,
+with one partition per school year. Each history size reseeds the schema.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.partitions --students 5000 --years 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app import crud, models, partitions, schemas
+from app.db import AsyncSessionLocal
+from app.importers import METRIC_IMPORT_CHUNK_SIZE
+from app.models import GrowthStatus
+from benchmarks._support import reset_schema, summarize
+
+
+async def seed(students: int, years: int, current_year: int, through: date) -> None:
+    async with AsyncSessionLocal() as db:
+        await partitions.create_partitions(db, current_year - years + 1, current_year + 1)
+        await db.execute(insert(models.Student), [
+            {"local_student_id": f"S{i:06d}", "first_name": "F", "last_name": f"L{i}", "grade_level": 9 + i % 4}
+            for i in range(students)
+        ])
+        # Weekly history generated server-side; enum labels are the member names.
+        first_day, _ = partitions.year_bounds(current_year - years + 1)
+        await db.execute(text(
+            "INSERT INTO student_metrics (student_id, as_of_date, attendance_percentage, growth_status, "
+            "credits_earned, expected_credits_for_grade) "
+            "SELECT s.id, d::date, 80 + random() * 20, 'meets', 0, 0 FROM students s "
+            "CROSS JOIN generate_series(CAST(:first AS date), CAST(:last AS date), interval '7 days') d"
+        ), {"first": first_day, "last": through})
+        await db.commit()
+        await db.execute(text("ANALYZE student_metrics"))
+
+
+async def insert_week(as_of_date: date) -> float:
+    rng = random.Random(as_of_date.toordinal())
+    async with AsyncSessionLocal() as db:
+        ids = (await db.execute(select(models.Student.id).order_by(models.Student.id))).scalars().all()
+        started = time.perf_counter()
+        for i in range(0, len(ids), METRIC_IMPORT_CHUNK_SIZE):
+            chunk = ids[i:i + METRIC_IMPORT_CHUNK_SIZE]
+            payloads = [
+                schemas.MetricIn(
+                    as_of_date=as_of_date,
+                    attendance_percentage=round(rng.uniform(80, 100), 1),
+                    growth_status=rng.choice(list(GrowthStatus)),
+                    credits_earned=4,
+                    expected_credits_for_grade=4,
+                )
+                for _ in chunk
+            ]
+            await crud.upsert_metrics(db, crud.metric_rows(chunk, payloads))
+            await db.commit()
+        return time.perf_counter() - started
+
+
+async def current_year_queries(year_start: date, students: int, reads: int) -> dict:
+    metric = models.StudentMetric
+    rng = random.Random(9)
+    status_counts, student_history = [], []
+    async with AsyncSessionLocal() as db:
+        for _ in range(reads):
+            started = time.perf_counter()
+            await db.execute(
+                select(metric.student_status, func.count())
+                .where(metric.as_of_date >= year_start)
+                .group_by(metric.student_status)
+            )
+            status_counts.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await db.execute(
+                select(metric)
+                .where(metric.student_id == rng.randint(1, students), metric.as_of_date >= year_start)
+                .order_by(metric.as_of_date)
+            )
+            student_history.append(time.perf_counter() - started)
+            db.expunge_all()
+    return {"status_counts": summarize(status_counts), "student_history": summarize(student_history)}
+
+
+async def main(args) -> None:
+    today = date.today()
+    current_year = partitions.school_year(today)
+    year_start, _ = partitions.year_bounds(current_year)
+    # History stops a week short of today; the timed insert writes today's week.
+    through = today - timedelta(days=7)
+
+    results = {}
+    for years in args.years:
+        await reset_schema()
+        await seed(args.students, years, current_year, through)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(select(func.count()).select_from(models.StudentMetric))).scalar_one()
+        elapsed = await insert_week(today)
+        results[f"{years}_years"] = {
+            "history_rows": rows,
+            "insert_week_seconds": round(elapsed, 3),
+            "insert_rows_per_second": round(args.students / elapsed),
+            **await current_year_queries(year_start, args.students, args.reads),
+        }
+    print(json.dumps({"students": args.students, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--reads", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,63 @@
+"""
+Request throughput and pool wait time against connection pool size.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.pool_size --sizes 1 2 5 10 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app import crud, db, schemas
+from app.telemetry import Histogram
+from benchmarks._support import app_client, create_admin, login, reset_schema, summarize, timed
+
+
+async def run_phase(client, headers, student_id: int, pool_size: int, requests: int, concurrency: int) -> dict:
+    engine = db.build_engine(pool_size=pool_size, max_overflow=0)
+    db.AsyncSessionLocal.configure(bind=engine)
+    db.pool_metrics.wait_seconds = Histogram()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            return await timed(lambda: client.get(f"/students/{student_id}", headers=headers))
+
+    try:
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        stats = db.pool_metrics.stats(engine)
+    finally:
+        await engine.dispose()
+    return {
+        "pool_size": pool_size,
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency": summarize(list(latencies)),
+        "pool_wait": stats["wait_seconds"],
+        "connects": stats["connects"],
+    }
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await create_admin()
+    async with db.AsyncSessionLocal() as session:
+        student = await crud.create_student(session, schemas.StudentCreate(
+            local_student_id="P0001", first_name="Pool", last_name="Bench", grade_level=11, diploma_path=None,
+        ))
+    async with app_client() as client:
+        headers = await login(client)
+        results = [
+            await run_phase(client, headers, student.id, size, args.requests, args.concurrency)
+            for size in args.sizes
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""
+Re-import cost of the same weekly metrics CSV through POST /imports/metrics_csv:
+first load, identical re-import, and re-import with a fraction of rows edited.
+Unchanged rows are matched by input digest and never rule-evaluated or written.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.reimport --rows 100000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app import models
+from app.db import AsyncSessionLocal
+from app.models import GrowthStatus
+from benchmarks._support import app_client, create_admin, login, reset_schema
+
+WEEKS = 10
+COLUMNS = ["local_student_id", "as_of_date", "attendance_percentage", "growth_status", "credits_earned", "expected_credits_for_grade"]
+
+
+def build_rows(students: int) -> list[dict]:
+    rng = random.Random(11)
+    start = date(2025, 8, 4)
+    return [
+        {
+            "local_student_id": f"S{i:06d}",
+            "as_of_date": (start + timedelta(weeks=w)).isoformat(),
+            "attendance_percentage": f"{rng.uniform(80, 100):.1f}",
+            "growth_status": rng.choice(list(GrowthStatus)).value,
+            "credits_earned": str(w // 3),
+            "expected_credits_for_grade": str(w // 3 + rng.randint(-1, 1)),
+        }
+        for i in range(students)
+        for w in range(WEEKS)
+    ]
+
+
+def to_csv(rows: list[dict]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode()
+
+
+async def upload(client, headers, body: bytes) -> dict:
+    started = time.perf_counter()
+    res = await client.post("/imports/metrics_csv", headers=headers, files={"file": ("metrics.csv", body, "text/csv")})
+    elapsed = time.perf_counter() - started
+    res.raise_for_status()
+    return {"seconds": round(elapsed, 3), **res.json()}
+
+
+async def main(args) -> None:
+    students = max(1, args.rows // WEEKS)
+    await reset_schema()
+    await create_admin()
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(models.Student), [
+            {"local_student_id": f"S{i:06d}", "first_name": "F", "last_name": f"L{i}", "grade_level": 9 + i % 4}
+            for i in range(students)
+        ])
+        await db.commit()
+
+    rows = build_rows(students)
+    edited = [dict(r) for r in rows]
+    for r in random.Random(13).sample(edited, int(len(edited) * args.changed)):
+        r["attendance_percentage"] = f"{float(r['attendance_percentage']) - 5:.1f}"
+
+    results = {}
+    async with app_client() as client:
+        headers = await login(client)
+        results["initial"] = await upload(client, headers, to_csv(rows))
+        results["identical"] = await upload(client, headers, to_csv(rows))
+        results[f"changed_{args.changed:.0%}"] = await upload(client, headers, to_csv(edited))
+    print(json.dumps({"rows": len(rows), **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of rows edited for the third upload")
+    asyncio.run(main(parser.parse_args()))
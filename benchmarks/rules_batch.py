@@ -0,0 +1,62 @@
+"""
+evaluate_rules (one RuleInput at a time) vs evaluate_rules_batch (NumPy columns).
+
+    python -m benchmarks.rules_batch --rows 10000 100000 1000000
+
+Row-for-row parity between the two is covered by tests/test_rules_batch.py.
+"""
+import argparse
+import json
+import random
+import time
+
+from app.models import GrowthStatus
+from app.rules import RuleInput, evaluate_rules, evaluate_rules_batch, growth_status_codes
+
+GROWTH = list(GrowthStatus)
+
+
+def synthetic(n: int, seed: int = 7):
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    attendance = [maybe(round(rng.uniform(80, 100), 1)) for _ in range(n)]
+    # Exercise the boundary: exactly at the threshold is not a risk.
+    attendance[: min(n, 10)] = [94.0] * min(n, 10)
+    growth = [rng.choice(GROWTH) for _ in range(n)]
+    earned = [maybe(rng.randint(0, 24)) for _ in range(n)]
+    expected = [maybe(rng.randint(0, 24)) for _ in range(n)]
+    return attendance, growth, earned, expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    results = []
+    for n in args.rows:
+        attendance, growth, earned, expected = synthetic(n)
+
+        started = time.perf_counter()
+        for i in range(n):
+            evaluate_rules(RuleInput(attendance[i], growth[i], earned[i], expected[i]))
+        scalar_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        evaluate_rules_batch(attendance, growth_status_codes(growth), earned, expected)
+        batch_s = time.perf_counter() - started
+
+        results.append({
+            "rows": n,
+            "scalar_seconds": round(scalar_s, 4),
+            "batch_seconds": round(batch_s, 4),
+            "speedup": round(scalar_s / batch_s, 1) if batch_s else None,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
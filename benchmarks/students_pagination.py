@@ -0,0 +1,70 @@
+"""
+Latency of fetching page N of GET /students with OFFSET vs keyset cursors.
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.students_pagination --students 50000 --page 500
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import insert
+
+from app import crud, models
+from app.db import AsyncSessionLocal
+from benchmarks._support import reset_schema, summarize
+
+LAST_NAMES = ["Smith", "Lee", "Garcia", "Nguyen", "Brown", "Patel", "Kim", "Lopez", "Clark", "Young"]
+
+
+async def seed(students: int) -> None:
+    rng = random.Random(11)
+    async with AsyncSessionLocal() as db:
+        for start in range(0, students, 5000):
+            await db.execute(insert(models.Student), [
+                {
+                    "local_student_id": f"S{i:07d}",
+                    # plenty of duplicate names, which is what made OFFSET ordering unstable
+                    "first_name": rng.choice(["Avery", "Jordan", "Sam", "Riley"]),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "grade_level": 9 + i % 4,
+                }
+                for i in range(start, min(start + 5000, students))
+            ])
+        await db.commit()
+
+
+async def main(args) -> None:
+    await reset_schema()
+    await seed(args.students)
+
+    async with AsyncSessionLocal() as db:
+        # Walk to the cursor that starts the requested page.
+        after = None
+        for _ in range(args.page - 1):
+            _, after = await crud.list_students_after(db, limit=args.limit, after=after)
+            db.expunge_all()
+
+        results = {}
+        for mode in ("offset", "cursor"):
+            latencies = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                if mode == "offset":
+                    await crud.list_students(db, limit=args.limit, offset=(args.page - 1) * args.limit)
+                else:
+                    await crud.list_students_after(db, limit=args.limit, after=after)
+                latencies.append(time.perf_counter() - started)
+                db.expunge_all()
+            results[mode] = summarize(latencies)
+    print(json.dumps({"students": args.students, "page": args.page, "limit": args.limit, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -9,6 +9,42 @@ class Settings(BaseSettings):
     jwt_expires_minutes: int = 120
     cors_origins: str = ""
 
+    # connection pool (app.db)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds; -1 disables
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection
+    db_pool_warm_connections: int = 5
+
+    # background imports (app.import_jobs); empty spool dir means the system temp dir
+    import_spool_dir: str = ""
+    import_max_concurrent_jobs: int = 1
+    # processes validating metrics CSV byte ranges (app.csv_parallel); 0 parses inline
+    import_parse_workers: int = 4
+
+    # POST /metrics/batch limits (after gzip decoding)
+    metrics_batch_max_items: int = 50000
+    metrics_batch_max_bytes: int = 64 * 1024 * 1024
+
+    # observability (app.telemetry)
+    slow_request_threshold_ms: float = 500.0
+    metrics_internal_port: int = 0  # requests arriving on this port may read /metrics/prometheus without a token
+
+    # argon2 runs on this many threads; 0 hashes inline on the event loop
+    password_hash_workers: int = 4
+
+    # verified-token cache in get_current_user; 0 disables it
+    auth_cache_size: int = 10000
+    auth_cache_ttl_seconds: int = 300
+
+    # buffered audit writer (app.audit)
+    audit_queue_size: int = 10000
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_enqueue_timeout_seconds: float = 0.5
+
     def cors_origin_list(self) -> List[str]:
         if not self.cors_origins.strip():
             return []
@@ -1,13 +1,111 @@
+import time
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.telemetry import Histogram, install_query_hooks
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+class PoolMetrics:
+    """Pool counters fed by SQLAlchemy pool events and InstrumentedPool."""
+
+    def __init__(self):
+        self.wait_seconds = Histogram()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0  # new DBAPI connections (churn)
+        self.closes = 0
+        self.invalidations = 0
+
+    def attach(self, engine) -> None:
+        pool = engine.sync_engine.pool
+
+        @event.listens_for(pool, "connect")
+        def _connect(dbapi_connection, record):
+            self.connects += 1
+
+        @event.listens_for(pool, "close")
+        def _close(dbapi_connection, record):
+            self.closes += 1
+
+        @event.listens_for(pool, "invalidate")
+        def _invalidate(dbapi_connection, record, exception):
+            self.invalidations += 1
+
+        @event.listens_for(pool, "checkout")
+        def _checkout(dbapi_connection, record, proxy):
+            self.checkouts += 1
+
+        @event.listens_for(pool, "checkin")
+        def _checkin(dbapi_connection, record):
+            self.checkins += 1
+
+    def stats(self, engine) -> dict:
+        pool = engine.sync_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "closes": self.closes,
+            "invalidations": self.invalidations,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Times how long each checkout waits for a free (or new) connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.wait_seconds.observe(time.perf_counter() - started)
+
+def build_engine(**overrides):
+    options = dict(
+        echo=False,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    if "+asyncpg" in settings.database_url:
+        # 0 is required behind pgbouncer in transaction mode
+        options["connect_args"] = {"statement_cache_size": settings.db_statement_cache_size}
+    options.update(overrides)
+    new_engine = create_async_engine(settings.database_url, **options)
+    pool_metrics.attach(new_engine)
+    install_query_hooks(new_engine)
+    return new_engine
+
+engine = build_engine()
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
 
 async def get_db() -> AsyncSession:
+    # AsyncSession checks a connection out lazily, on its first statement,
+    # so requests that never query do not touch the pool.
     async with AsyncSessionLocal() as session:
         yield session
+
+async def warm_pool(connections: int) -> None:
+    """Open up to `connections` pooled connections now rather than on the first requests."""
+    if connections <= 0:
+        return
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await engine.connect())
+    finally:
+        for conn in opened:
+            await conn.close()
@@ -1,14 +1,104 @@
-from fastapi import Depends, HTTPException, status
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.config import settings
 from app.db import get_db
 from app.models import User, Role
 from app.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
+
+@dataclass(frozen=True)
+class Principal:
+    """The slice of a User that authorization needs; safe to keep across requests."""
+    id: int
+    email: str
+    role: Role
+    student_id: Optional[int]
+
+class PrincipalCache:
+    """
+    Bounded LRU of verified token -> (claims, Principal).
+    Entries live until the token's exp or ttl_seconds, whichever is first,
+    so role changes made by another worker are picked up within the TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict, Principal]] = OrderedDict()
+        self._tokens_by_email: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                self._discard(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, token: str, claims: dict, principal: Principal) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        self._entries[token] = (expires_at, claims, principal)
+        self._entries.move_to_end(token)
+        self._tokens_by_email.setdefault(principal.email, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_user(self, email: str) -> None:
+        """Drop every cached token for a user; call whenever their role or account changes."""
+        for token in self._tokens_by_email.pop(email.lower().strip(), set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_email.clear()
+
+    def _discard(self, token: str) -> None:
+        _, _, principal = self._entries.pop(token)
+        tokens = self._tokens_by_email.get(principal.email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_email[principal.email]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+principal_cache = PrincipalCache(settings.auth_cache_size, settings.auth_cache_ttl_seconds)
+
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    if principal_cache.enabled:
+        cached = principal_cache.get(token)
+        if cached is not None:
+            return cached
 
-async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
     try:
         payload = decode_token(token)
     except ValueError:
@@ -22,11 +112,30 @@ async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depe
     user = res.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+
+    principal = Principal(id=user.id, email=user.email, role=user.role, student_id=user.student_id)
+    if principal_cache.enabled:
+        principal_cache.put(token, payload, principal)
+    return principal
 
 def require_roles(*allowed: Role):
-    async def _guard(user: User = Depends(get_current_user)) -> User:
+    async def _guard(user: Principal = Depends(get_current_user)) -> Principal:
         if user.role not in allowed:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return user
     return _guard
+
+async def require_admin_or_internal(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> None:
+    """Allow admins, or any caller on settings.metrics_internal_port (the socket port, not the Host header)."""
+    server = request.scope.get("server")
+    if settings.metrics_internal_port and server and server[1] == settings.metrics_internal_port:
+        return
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user = await get_current_user(db=db, token=token)
+    if user.role != Role.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Date, Enum, ForeignKey, UniqueConstraint, Boolean, DateTime, func
+from sqlalchemy import DDL, event, String, Integer, Float, Text, Date, Enum, ForeignKey, UniqueConstraint, Index, Boolean, DateTime, JSON, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 import enum
@@ -21,6 +21,12 @@ class StudentStatus(str, enum.Enum):
     at_risk = "AT_RISK"
     high_risk = "HIGH_RISK"
 
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
 class User(Base):
     __tablename__ = "users"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -34,24 +40,37 @@ class User(Base):
 
 class Student(Base):
     __tablename__ = "students"
+    # keyset pagination order for GET /students
+    __table_args__ = (Index("ix_students_name_id", "last_name", "first_name", "id"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     local_student_id: Mapped[str] = mapped_column(String(64), unique=True, index=True)
     first_name: Mapped[str] = mapped_column(String(80))
     last_name: Mapped[str] = mapped_column(String(80))
     grade_level: Mapped[int] = mapped_column(Integer)  # 6-12 etc
     diploma_path: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)
+    # bumped by the write paths (crud.upsert_students, crud.update_student); part of the detail ETag.
+    # A plain column, not a mapper version_id_col: concurrent edits must not fail a stale-row check.
+    row_version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
 
     user: Mapped[Optional[User]] = relationship(back_populates="student")
     metrics: Mapped[List["StudentMetric"]] = relationship(back_populates="student", cascade="all, delete-orphan")
 
 class StudentMetric(Base):
+    """
+    Range-partitioned by as_of_date, one partition per school year (see
+    app.partitions), so the partition key is part of every unique key.
+    """
     __tablename__ = "student_metrics"
-    __table_args__ = (UniqueConstraint("student_id", "as_of_date", name="uq_student_asof"),)
+    __table_args__ = (
+        UniqueConstraint("student_id", "as_of_date", name="uq_student_asof"),
+        Index("ix_student_metrics_student_id_as_of_date", "student_id", text("as_of_date DESC")),
+        {"postgresql_partition_by": "RANGE (as_of_date)"},
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     student_id: Mapped[int] = mapped_column(ForeignKey("students.id"), index=True)
 
-    as_of_date: Mapped[Date] = mapped_column(Date, index=True)
+    as_of_date: Mapped[Date] = mapped_column(Date, primary_key=True, index=True)
 
     attendance_percentage: Mapped[Optional[float]] = mapped_column(nullable=True)  # 0-100
     growth_status: Mapped[GrowthStatus] = mapped_column(Enum(GrowthStatus), default=GrowthStatus.no_data)
@@ -66,10 +85,120 @@ class StudentMetric(Base):
     student_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus), default=StudentStatus.on_track)
     intervention_required: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # crud.metric_digest of the input columns; NULL for rows written before it existed
+    input_digest: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
     created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # set again by every upsert and re-score that rewrites the row; incremental exports filter on it
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     student: Mapped["Student"] = relationship(back_populates="metrics")
 
+# Rows outside every school-year partition land here until
+# `python -m app.manage create-partitions` moves them out.
+event.listen(
+    StudentMetric.__table__,
+    "after_create",
+    DDL("CREATE TABLE student_metrics_default PARTITION OF student_metrics DEFAULT"),
+)
+
+class ImportJob(Base):
+    """A CSV import processed in the background in committed chunks (see app.import_jobs)."""
+    __tablename__ = "import_jobs"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))  # "students" | "metrics"
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.pending)
+    requested_by_user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    spool_path: Mapped[str] = mapped_column(String(1024))
+
+    total_rows: Mapped[int] = mapped_column(Integer, default=0)
+    # resume point: data rows (valid or not) covered by committed chunks
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    counts: Mapped[dict] = mapped_column(JSON, default=dict)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[list] = mapped_column(JSON, default=list)
+    rows_per_second: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+class StudentCurrentStatus(Base):
+    """
+    Projection of each student's latest StudentMetric, maintained in the same
+    transaction as every metric write (see crud.refresh_current_status).
+    """
+    __tablename__ = "student_current_status"
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"), primary_key=True)
+    metric_id: Mapped[int] = mapped_column(Integer, index=True)
+    as_of_date: Mapped[Date] = mapped_column(Date)
+
+    attendance_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    academic_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    graduation_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    risk_flag_count: Mapped[int] = mapped_column(Integer, default=0)
+    student_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus), default=StudentStatus.on_track)
+    intervention_required: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class StudentStatusTransition(Base):
+    """
+    A change of student_status or intervention_required between a student's
+    metric on as_of_date and their previous metric, kept current by
+    crud.record_transitions on every metric write.
+    """
+    __tablename__ = "student_status_transitions"
+    __table_args__ = (
+        UniqueConstraint("student_id", "as_of_date", name="uq_transition_student_asof"),
+        Index("ix_student_status_transitions_as_of_date_id", "as_of_date", "id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"))
+    as_of_date: Mapped[Date] = mapped_column(Date)
+    from_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus))
+    to_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus))
+    from_intervention: Mapped[bool] = mapped_column(Boolean)
+    to_intervention: Mapped[bool] = mapped_column(Boolean)
+
+class StatusSnapshot(Base):
+    """A point-in-time snapshot date whose rows are materialized in status_snapshot_rows (see app.snapshots)."""
+    __tablename__ = "status_snapshots"
+    snapshot_date: Mapped[Date] = mapped_column(Date, primary_key=True)
+    student_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class StatusSnapshotRow(Base):
+    """Each student's latest metric with as_of_date <= snapshot_date, as it stood when materialized."""
+    __tablename__ = "status_snapshot_rows"
+    snapshot_date: Mapped[Date] = mapped_column(Date, primary_key=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"), primary_key=True)
+    metric_id: Mapped[int] = mapped_column(Integer)
+    as_of_date: Mapped[Date] = mapped_column(Date)
+
+    attendance_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    academic_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    graduation_risk_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    risk_flag_count: Mapped[int] = mapped_column(Integer, default=0)
+    student_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus), default=StudentStatus.on_track)
+    intervention_required: Mapped[bool] = mapped_column(Boolean, default=False)
+
+class RiskRollup(Base):
+    """
+    Count of metrics per (as_of_date, grade_level, diploma_path, status, intervention),
+    kept current by crud.apply_rollup_deltas on every metric write.
+    diploma_path is "" when the student has none so it can be part of the key.
+    """
+    __tablename__ = "risk_rollups"
+    as_of_date: Mapped[Date] = mapped_column(Date, primary_key=True)
+    grade_level: Mapped[int] = mapped_column(Integer, primary_key=True)
+    diploma_path: Mapped[str] = mapped_column(String(80), primary_key=True, default="")
+    student_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus), primary_key=True)
+    intervention_required: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    student_count: Mapped[int] = mapped_column(Integer, default=0)
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -78,3 +207,21 @@ class AuditLog(Base):
     target_type: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)
     target_id: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)
     created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class RescoreJob(Base):
+    """Checkpointed re-evaluation of stored student_metrics rows (see app.rescore)."""
+    __tablename__ = "rescore_jobs"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.pending)
+    requested_by_user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # keyset checkpoint: every metric with id <= last_metric_id has been re-scored
+    last_metric_id: Mapped[int] = mapped_column(Integer, default=0)
+    rows_scanned: Mapped[int] = mapped_column(Integer, default=0)
+    rows_changed: Mapped[int] = mapped_column(Integer, default=0)
+    rows_per_second: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
+import numpy as np
 from app.models import GrowthStatus, StudentStatus
 
 ATTENDANCE_THRESHOLD = 94.0
@@ -62,3 +63,58 @@ def evaluate_rules(inp: RuleInput) -> RuleOutput:
         student_status=student_status,
         intervention_required=intervention_required,
     )
+
+
+# Columnar encodings used by evaluate_rules_batch.
+GROWTH_STATUS_CODES = {status: code for code, status in enumerate(GrowthStatus)}
+GROWTH_STATUS_BY_CODE = tuple(GrowthStatus)
+# A row's status code is its risk flag count.
+STUDENT_STATUS_BY_CODE = (StudentStatus.on_track, StudentStatus.watch, StudentStatus.at_risk, StudentStatus.high_risk)
+
+@dataclass
+class RuleBatchOutput:
+    attendance_risk_flag: np.ndarray
+    academic_risk_flag: np.ndarray
+    graduation_risk_flag: np.ndarray
+    risk_flag_count: np.ndarray
+    student_status: np.ndarray  # codes into STUDENT_STATUS_BY_CODE
+    intervention_required: np.ndarray
+
+def growth_status_codes(values: Sequence[GrowthStatus | str]) -> np.ndarray:
+    return np.fromiter((GROWTH_STATUS_CODES[GrowthStatus(v)] for v in values), dtype=np.int8, count=len(values))
+
+def evaluate_rules_batch(
+    attendance_percentage: Sequence[Optional[float]] | np.ndarray,
+    growth_status: np.ndarray,
+    credits_earned: Sequence[Optional[int]] | np.ndarray,
+    expected_credits_for_grade: Sequence[Optional[int]] | np.ndarray,
+) -> RuleBatchOutput:
+    """
+    Column-wise evaluate_rules. growth_status holds GROWTH_STATUS_CODES values;
+    None (or NaN) in the numeric columns means "no data" and never raises a flag,
+    exactly like the scalar rules.
+    """
+    attendance = np.asarray(attendance_percentage, dtype=np.float64)
+    earned = np.asarray(credits_earned, dtype=np.float64)
+    expected = np.asarray(expected_credits_for_grade, dtype=np.float64)
+
+    # NaN comparisons are False, which is the NULL behaviour we want.
+    with np.errstate(invalid="ignore"):
+        attendance_risk_flag = attendance < ATTENDANCE_THRESHOLD
+        graduation_risk_flag = earned < expected
+    academic_risk_flag = np.asarray(growth_status) == GROWTH_STATUS_CODES[GrowthStatus.below]
+
+    risk_flag_count = (
+        attendance_risk_flag.astype(np.int8)
+        + academic_risk_flag.astype(np.int8)
+        + graduation_risk_flag.astype(np.int8)
+    )
+
+    return RuleBatchOutput(
+        attendance_risk_flag=attendance_risk_flag,
+        academic_risk_flag=academic_risk_flag,
+        graduation_risk_flag=graduation_risk_flag,
+        risk_flag_count=risk_flag_count,
+        student_status=risk_flag_count.copy(),
+        intervention_required=risk_flag_count >= 2,
+    )
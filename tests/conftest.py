@@ -0,0 +1,82 @@
+"""
+Database tests run against the Postgres at TEST_DATABASE_URL (an asyncpg URL)
+and DROP/CREATE the schema there, so point it at a scratch database. They are
+skipped when it is not set.
+"""
+import os
+from datetime import date
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models  # noqa: F401 (register metadata)
+from app import schemas
+from app.db import Base, get_db
+from app.deps import Principal, get_current_user
+from app.models import GrowthStatus, Role
+from app.routers import metrics as metrics_router, students as students_router
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+
+@pytest_asyncio.fixture
+async def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def client(db):
+    """The metrics and students routers on the test session, called as an admin."""
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    app.include_router(students_router.router)
+
+    async def test_db():
+        yield db
+
+    app.dependency_overrides[get_db] = test_db
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=1, email="admin@test", role=Role.admin, student_id=None)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def student(local_id: str, grade_level: int, diploma_path: str | None = None) -> dict:
+    return schemas.StudentCreate(
+        local_student_id=local_id,
+        first_name="Test",
+        last_name=local_id,
+        grade_level=grade_level,
+        diploma_path=diploma_path,
+    ).model_dump()
+
+
+def metric(
+    as_of_date: date,
+    attendance: float | None = 96.0,
+    growth_status: GrowthStatus = GrowthStatus.meets,
+    credits_earned: int | None = 6,
+    expected_credits: int | None = 6,
+) -> schemas.MetricIn:
+    return schemas.MetricIn(
+        as_of_date=as_of_date,
+        attendance_percentage=attendance,
+        growth_status=growth_status,
+        credits_earned=credits_earned,
+        expected_credits_for_grade=expected_credits,
+    )
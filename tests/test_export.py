@@ -0,0 +1,46 @@
+"""Export queries: the students export is complete and changed_since follows updated_at."""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud, export
+from app.models import GrowthStatus
+from tests.conftest import metric, student
+
+WEEK_1, WEEK_2 = date(2026, 9, 7), date(2026, 9, 14)
+
+
+@pytest.mark.asyncio
+async def test_students_export_includes_students_without_metrics(db):
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 10)])
+    ids = await crud.student_ids_by_local_id(db, ["S1", "S2"])
+    await crud.upsert_metrics(db, [crud.metric_values(ids["S1"], metric(WEEK_1))])
+    await db.commit()
+
+    rows = (await db.execute(export.students_export_query())).all()
+    assert [r[1] for r in rows] == ["S1", "S2"]
+    assert {r[0] for r in (await db.execute(export.export_query())).all()} == {ids["S1"]}
+
+
+@pytest.mark.asyncio
+async def test_changed_since_returns_rows_rewritten_after_the_cutoff(db):
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 9)])
+    ids = await crud.student_ids_by_local_id(db, ["S1", "S2"])
+    await crud.upsert_metrics(db, [
+        crud.metric_values(ids["S1"], metric(WEEK_1)),
+        crud.metric_values(ids["S1"], metric(WEEK_2)),
+        crud.metric_values(ids["S2"], metric(WEEK_1)),
+    ])
+    await db.commit()
+    cutoff = await db.scalar(select(func.clock_timestamp()))
+    await db.commit()
+
+    # A correction to an old row: created before the cutoff, updated after it.
+    await crud.upsert_metrics(db, [crud.metric_values(ids["S1"], metric(WEEK_1, growth_status=GrowthStatus.below))])
+    await db.commit()
+
+    rows = (await db.execute(export.export_query(changed_since=cutoff))).all()
+    assert [(r[0], r.as_of_date) for r in rows] == [(ids["S1"], WEEK_1)]
+    assert rows[0].created_at < cutoff <= rows[0].updated_at
+    assert (await db.execute(export.export_query(changed_since=cutoff, start=WEEK_2))).all() == []
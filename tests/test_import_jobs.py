@@ -0,0 +1,11 @@
+from collections import Counter
+
+from app.import_jobs import merge_counts
+
+
+def test_merge_counts_keeps_zero_counts():
+    first = merge_counts({}, Counter(imported=0, created=0, updated=0, unchanged=5))
+    assert first == {"imported": 0, "created": 0, "updated": 0, "unchanged": 5}
+
+    second = merge_counts(first, Counter(imported=2, created=2, updated=0, unchanged=0))
+    assert second == {"imported": 2, "created": 2, "updated": 0, "unchanged": 5}
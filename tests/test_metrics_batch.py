@@ -0,0 +1,86 @@
+"""POST /metrics/batch: body formats, per-item results and limits."""
+import gzip
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud
+from app.config import settings
+from app.models import StudentMetric
+from tests.conftest import student
+
+
+def item(as_of_date: str, **fields) -> dict:
+    return {"as_of_date": as_of_date, "attendance_percentage": 96.0, "growth_status": "MEETS", **fields}
+
+
+async def _students(db) -> dict[str, int]:
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 10)])
+    await db.commit()
+    return await crud.student_ids_by_local_id(db, ["S1", "S2"])
+
+
+async def _metric_count(db) -> int:
+    return await db.scalar(select(func.count()).select_from(StudentMetric))
+
+
+@pytest.mark.asyncio
+async def test_results_per_item_with_duplicates_and_bad_items(client, db):
+    ids = await _students(db)
+    body = [
+        item("2026-09-07", local_student_id="S1"),
+        item("2026-09-07", student_id=ids["S2"], growth_status="SOMETIMES"),
+        item("2026-09-14", student_id=ids["S2"]),
+        item("2026-09-07", local_student_id="NOPE"),
+        item("2026-09-07", local_student_id="S1", growth_status="BELOW"),
+    ]
+    res = await client.post("/metrics/batch", json=body)
+    assert res.status_code == 200
+    out = res.json()
+
+    assert [r["status"] for r in out["results"]] == ["superseded", "error", "created", "error", "created"]
+    assert out["results"][0]["superseded_by"] == 4
+    assert out["results"][1]["error"].startswith("growth_status")
+    assert out["results"][3]["error"] == "Unknown local_student_id: NOPE"
+    assert (out["created"], out["updated"], out["superseded"], out["errors"]) == (2, 0, 1, 2)
+
+    # The later duplicate is the one stored.
+    stored = await db.scalar(select(StudentMetric.growth_status).where(StudentMetric.student_id == ids["S1"]))
+    assert stored.value == "BELOW"
+    assert await _metric_count(db) == 2
+
+
+@pytest.mark.asyncio
+async def test_gzipped_ndjson_body(client, db):
+    ids = await _students(db)
+    lines = [
+        json.dumps(item("2026-09-07", local_student_id="S1")),
+        "{not json",
+        json.dumps(item("2026-09-07", student_id=ids["S2"])),
+    ]
+    body = gzip.compress(("\n".join(lines) + "\n").encode())
+    headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+
+    res = await client.post("/metrics/batch", content=body, headers=headers)
+    assert res.status_code == 200
+    assert [r["status"] for r in res.json()["results"]] == ["created", "error", "created"]
+    assert res.json()["results"][1]["error"].startswith("Invalid JSON")
+
+    res = await client.post("/metrics/batch", content=body, headers=headers)
+    assert [r["status"] for r in res.json()["results"]] == ["updated", "error", "updated"]
+
+
+@pytest.mark.asyncio
+async def test_too_many_items_is_rejected_before_writing(client, db, monkeypatch):
+    await _students(db)
+    monkeypatch.setattr(settings, "metrics_batch_max_items", 2)
+
+    body = [item(f"2026-09-{day:02d}", local_student_id="S1") for day in (7, 14, 21)]
+    res = await client.post("/metrics/batch", json=body)
+    assert res.status_code == 413
+    assert await _metric_count(db) == 0
+
+    res = await client.post("/metrics/batch", json=body[:2])
+    assert res.status_code == 200
+    assert await _metric_count(db) == 2
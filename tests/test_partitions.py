@@ -0,0 +1,43 @@
+"""Archiving and restoring a school year must keep student_current_status pointing at real metrics."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app import crud, models, partitions
+from tests.conftest import metric, student
+
+SY2024, SY2025 = date(2024, 10, 1), date(2025, 10, 1)
+
+
+async def _projection(db) -> dict[int, date]:
+    res = await db.execute(select(models.StudentCurrentStatus.student_id, models.StudentCurrentStatus.as_of_date))
+    return dict(res.all())
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_repoint_current_status(db, tmp_path):
+    await partitions.create_partitions(db, 2024, 2025)
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 9), student("S3", 9)])
+    ids = await crud.student_ids_by_local_id(db, ["S1", "S2", "S3"])
+    await crud.upsert_metrics(db, [
+        crud.metric_values(ids["S1"], metric(SY2024)),
+        crud.metric_values(ids["S1"], metric(SY2025)),
+        crud.metric_values(ids["S2"], metric(SY2024)),
+        crud.metric_values(ids["S3"], metric(SY2025)),
+    ])
+    await db.commit()
+
+    path, rows = await partitions.archive_partition(db, 2025, str(tmp_path))
+    await db.commit()
+    assert rows == 2
+    # S1 falls back to its 2024 metric; S3 has nothing left.
+    assert await _projection(db) == {ids["S1"]: SY2024, ids["S2"]: SY2024}
+    roster, _ = await crud.list_roster(db)
+    assert all(m is not None for s, m in roster if s.id != ids["S3"])
+
+    await partitions.restore_partition(db, path)
+    await db.commit()
+    assert await _projection(db) == {ids["S1"]: SY2025, ids["S2"]: SY2024, ids["S3"]: SY2025}
+    roster, _ = await crud.list_roster(db)
+    assert all(m is not None for _, m in roster)
@@ -0,0 +1,86 @@
+"""Unchanged rows must digest the same on every write path, so re-imports write nothing."""
+import csv
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app import crud, csv_parallel
+from app.importers import import_metric_batch, import_metric_rows, metric_in, metric_inputs
+from app.models import GrowthStatus
+from app.rules import growth_status_codes
+from tests.conftest import student
+from tests.test_statement_counts import count_statements
+
+COLUMNS = ["local_student_id", "as_of_date", "attendance_percentage", "growth_status", "credits_earned", "expected_credits_for_grade"]
+ROWS = [
+    {"local_student_id": "S1", "as_of_date": "2026-09-07", "attendance_percentage": "95.5", "growth_status": "MEETS", "credits_earned": "6", "expected_credits_for_grade": "6"},
+    {"local_student_id": "S1", "as_of_date": "2026-09-14", "attendance_percentage": "", "growth_status": "", "credits_earned": "", "expected_credits_for_grade": ""},
+    {"local_student_id": "S2", "as_of_date": "2026-09-07", "attendance_percentage": "nan", "growth_status": "BELOW", "credits_earned": "3", "expected_credits_for_grade": ""},
+]
+
+
+def _column_digests(rows: list[dict]) -> list[str]:
+    """Digests as the process-pool path computes them: float64 columns with NaN for missing values."""
+    inputs = [metric_inputs(r) for r in rows]
+
+    def column(i: int) -> np.ndarray:
+        return np.array([math.nan if v[i] is None else v[i] for v in inputs], dtype=np.float64)
+
+    out = crud.metric_column_rows(
+        [1] * len(rows),
+        [date.fromisoformat(r["as_of_date"]) for r in rows],
+        column(0),
+        growth_status_codes([v[1] for v in inputs]),
+        column(2),
+        column(3),
+    )
+    return [r["input_digest"] for r in out]
+
+
+def test_every_path_digests_a_row_the_same():
+    csv_digests = [crud.metric_digest(metric_inputs(r)) for r in ROWS]
+    assert _column_digests(ROWS) == csv_digests
+    assert [crud.metric_values(1, metric_in(r))["input_digest"] for r in ROWS] == csv_digests
+    assert [r["input_digest"] for r in crud.metric_rows([1] * len(ROWS), [metric_in(r) for r in ROWS])] == csv_digests
+    # NaN is "no data", like a blank.
+    assert crud.metric_digest((math.nan, GrowthStatus.no_data, None, None)) == crud.metric_digest((None, GrowthStatus.no_data, None, None))
+
+
+def _metric_writes(statements: list[str]) -> list[str]:
+    return [s for s in statements if s.lstrip().upper().startswith(("INSERT INTO STUDENT_METRICS", "UPDATE STUDENT_METRICS"))]
+
+
+@pytest.mark.asyncio
+async def test_reimport_across_paths_writes_nothing(engine, db, tmp_path):
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 9)])
+    await db.commit()
+    student_ids = await crud.student_ids_by_local_id(db, ["S1", "S2"])
+
+    # First write through the per-row CSV path.
+    counts, errors = await import_metric_rows(db, ROWS)
+    await db.commit()
+    assert errors == [] and counts["imported"] == 3
+
+    # The same rows again through the process-pool path's column batches.
+    path = tmp_path / "metrics.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(ROWS)
+    fieldnames, ranges = csv_parallel.split_ranges(str(path), 1)
+    parsed = csv_parallel.parse_metric_range(str(path), *ranges[0], fieldnames)
+    assert parsed.error_count == 0
+    with count_statements(engine) as statements:
+        counts = await import_metric_batch(db, parsed.batch, student_ids)
+    await db.commit()
+    assert counts["imported"] == 0 and counts["unchanged"] == 3
+    assert _metric_writes(statements) == []
+
+    # And back through the per-row path.
+    with count_statements(engine) as statements:
+        counts, _ = await import_metric_rows(db, ROWS)
+    await db.commit()
+    assert counts["imported"] == 0 and counts["unchanged"] == 3
+    assert _metric_writes(statements) == []
@@ -0,0 +1,21 @@
+"""Starting a re-score must not race: one unfinished job at a time."""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app import rescore
+
+
+@pytest.mark.asyncio
+async def test_concurrent_starts_create_one_job(engine):
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def start():
+        async with sessions() as db:
+            return await rescore.create_job(db, None)
+
+    results = await asyncio.gather(*(start() for _ in range(4)))
+    created = [job for job, _ in results if job is not None]
+    assert len(created) == 1
+    assert all(unfinished == created[0].id for job, unfinished in results if job is None)
@@ -0,0 +1,95 @@
+"""risk_rollups must keep matching a live GROUP BY over student_metrics."""
+from datetime import date
+
+import pytest
+
+from app import crud
+from app.models import GrowthStatus
+from tests.conftest import metric, student
+
+WEEK_1, WEEK_2 = date(2026, 9, 7), date(2026, 9, 14)
+
+
+async def _seed(db) -> dict[str, int]:
+    await crud.upsert_students(db, [student("S1", 9), student("S2", 9, "STANDARD")])
+    ids = await crud.student_ids_by_local_id(db, ["S1", "S2"])
+    await crud.upsert_metrics(db, [
+        crud.metric_values(ids["S1"], metric(WEEK_1, attendance=90.0)),
+        crud.metric_values(ids["S1"], metric(WEEK_2, growth_status=GrowthStatus.below, credits_earned=4)),
+        crud.metric_values(ids["S2"], metric(WEEK_1)),
+    ])
+    await db.commit()
+    return ids
+
+
+async def _counts_by_grade(db) -> dict[tuple, int]:
+    counts: dict[tuple, int] = {}
+    for r in await crud.risk_rollups(db):
+        key = (r.as_of_date, r.grade_level, r.diploma_path)
+        counts[key] = counts.get(key, 0) + r.student_count
+    return counts
+
+
+@pytest.mark.asyncio
+async def test_grade_change_moves_metrics_to_new_buckets(db):
+    ids = await _seed(db)
+    assert await crud.risk_rollup_drift(db) == []
+
+    created, updated, unchanged = await crud.upsert_students(db, [student("S1", 10), student("S2", 9, "STANDARD")])
+    await db.commit()
+    assert (created, updated, unchanged) == (0, 1, 1)
+
+    assert await crud.risk_rollup_drift(db) == []
+    assert await _counts_by_grade(db) == {
+        (WEEK_1, 10, ""): 1,
+        (WEEK_2, 10, ""): 1,
+        (WEEK_1, 9, "STANDARD"): 1,
+    }
+
+    # Later deltas for the student land in (and come out of) the new grade's buckets.
+    await crud.upsert_metrics(db, [crud.metric_values(ids["S1"], metric(WEEK_2))])
+    await db.commit()
+    assert await crud.risk_rollup_drift(db) == []
+    assert all(r.student_count > 0 for r in await crud.risk_rollups(db))
+
+
+@pytest.mark.asyncio
+async def test_diploma_path_change_moves_metrics_to_new_buckets(db):
+    await _seed(db)
+
+    await crud.upsert_students(db, [student("S2", 9, "ADVANCED")])
+    await db.commit()
+
+    assert await crud.risk_rollup_drift(db) == []
+    assert (WEEK_1, 9, "STANDARD") not in await _counts_by_grade(db)
+    assert (await _counts_by_grade(db))[(WEEK_1, 9, "ADVANCED")] == 1
+
+
+@pytest.mark.asyncio
+async def test_name_only_change_leaves_buckets_alone(db):
+    await _seed(db)
+    before = await _counts_by_grade(db)
+
+    renamed = {**student("S1", 9), "first_name": "Renamed"}
+    assert await crud.upsert_students(db, [renamed]) == (0, 1, 0)
+    await db.commit()
+
+    assert await _counts_by_grade(db) == before
+    assert await crud.risk_rollup_drift(db) == []
+
+
+@pytest.mark.asyncio
+async def test_update_student_moves_buckets_and_bumps_row_version(db):
+    ids = await _seed(db)
+    before = await crud.get_student(db, ids["S1"])
+    version = before.row_version
+
+    updated = await crud.update_student(db, ids["S1"], {"grade_level": 11, "first_name": before.first_name})
+    assert updated.grade_level == 11
+    assert updated.row_version == version + 1
+    assert await crud.risk_rollup_drift(db) == []
+    assert (await _counts_by_grade(db))[(WEEK_1, 11, "")] == 1
+
+    # Nothing changed: no bump.
+    assert (await crud.update_student(db, ids["S1"], {"grade_level": 11})).row_version == version + 1
+    assert await crud.update_student(db, 0, {"grade_level": 11}) is None
@@ -0,0 +1,72 @@
+"""evaluate_rules_batch must agree with evaluate_rules row for row."""
+import itertools
+
+import pytest
+
+from app.models import GrowthStatus, StudentStatus
+from app.rules import (
+    ATTENDANCE_THRESHOLD,
+    RuleInput,
+    STUDENT_STATUS_BY_CODE,
+    evaluate_rules,
+    evaluate_rules_batch,
+    growth_status_codes,
+)
+
+ATTENDANCE = [None, 0.0, 93.9, 93.99, ATTENDANCE_THRESHOLD, 94.01, 100.0]
+CREDITS = [None, 0, 5, 6]
+
+
+def _batch_rows(attendance, growth, earned, expected) -> list[tuple]:
+    out = evaluate_rules_batch(attendance, growth_status_codes(growth), earned, expected)
+    return [
+        (
+            bool(out.attendance_risk_flag[i]),
+            bool(out.academic_risk_flag[i]),
+            bool(out.graduation_risk_flag[i]),
+            int(out.risk_flag_count[i]),
+            STUDENT_STATUS_BY_CODE[out.student_status[i]],
+            bool(out.intervention_required[i]),
+        )
+        for i in range(len(attendance))
+    ]
+
+
+def _scalar_row(attendance, growth, earned, expected) -> tuple:
+    out = evaluate_rules(RuleInput(attendance, growth, earned, expected))
+    return (
+        out.attendance_risk_flag,
+        out.academic_risk_flag,
+        out.graduation_risk_flag,
+        out.risk_flag_count,
+        out.student_status,
+        out.intervention_required,
+    )
+
+
+def test_batch_matches_scalar_for_every_combination():
+    # Every GrowthStatus against NULLs in each numeric column and both sides of the boundaries.
+    cases = list(itertools.product(ATTENDANCE, list(GrowthStatus), CREDITS, CREDITS))
+    batch = _batch_rows(*(list(column) for column in zip(*cases)))
+    for case, row in zip(cases, batch):
+        assert row == _scalar_row(*case), case
+
+
+@pytest.mark.parametrize("attendance, flagged", [(ATTENDANCE_THRESHOLD, False), (93.99, True), (None, False)])
+def test_attendance_threshold_is_exclusive(attendance, flagged):
+    out = evaluate_rules_batch([attendance], growth_status_codes([GrowthStatus.meets]), [None], [None])
+    assert bool(out.attendance_risk_flag[0]) is flagged
+
+
+def test_all_null_row_is_on_track():
+    out = evaluate_rules_batch([None], growth_status_codes([GrowthStatus.no_data]), [None], [None])
+    assert int(out.risk_flag_count[0]) == 0
+    assert STUDENT_STATUS_BY_CODE[out.student_status[0]] == StudentStatus.on_track
+    assert not bool(out.intervention_required[0])
+
+
+def test_nan_means_no_data():
+    out = evaluate_rules_batch([float("nan")], growth_status_codes([GrowthStatus.below]), [float("nan")], [3.0])
+    assert not bool(out.attendance_risk_flag[0])
+    assert not bool(out.graduation_risk_flag[0])
+    assert bool(out.academic_risk_flag[0])
@@ -0,0 +1,80 @@
+"""
+Statements issued per call, counted with a before_cursor_execute listener.
+The write-path counts are pinned: a change that adds a round trip to every
+metric write has to update them here.
+"""
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.models import GrowthStatus
+from tests.conftest import metric, student
+
+# INSERT metric, projection upsert, student dims + rollup upsert,
+# transition neighbours + states + delete, two snapshot deletes, refresh SELECT.
+ADD_METRIC_STATEMENTS = 10
+# Existing-row SELECT, metric upsert, projection upsert, student dims + rollup
+# upsert, transition neighbours + states + delete, two snapshot deletes.
+UPSERT_METRICS_STATEMENTS = 9
+
+
+@contextmanager
+def count_statements(engine):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _students(db, n: int) -> list[int]:
+    await crud.upsert_students(db, [student(f"S{i:03d}", 9 + i % 4) for i in range(n)])
+    await db.commit()
+    ids = await crud.student_ids_by_local_id(db, [f"S{i:03d}" for i in range(n)])
+    return [ids[f"S{i:03d}"] for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_add_metric_statement_count(engine, db):
+    (student_id,) = await _students(db, 1)
+
+    with count_statements(engine) as statements:
+        await crud.add_metric(db, student_id, metric(date(2026, 9, 7), attendance=90.0))
+    assert len(statements) == ADD_METRIC_STATEMENTS, statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", [1, 50])
+async def test_upsert_metrics_statement_count_does_not_grow_with_rows(engine, db, n):
+    student_ids = await _students(db, n)
+    rows = [
+        crud.metric_values(student_id, metric(date(2026, 9, 7), growth_status=GrowthStatus.below))
+        for student_id in student_ids
+    ]
+
+    with count_statements(engine) as statements:
+        await crud.upsert_metrics(db, rows)
+    await db.commit()
+    assert len(statements) == UPSERT_METRICS_STATEMENTS, statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [5, 50])
+async def test_roster_is_one_statement_whatever_the_page_size(engine, db, limit):
+    student_ids = await _students(db, 60)
+    await crud.upsert_metrics(db, [crud.metric_values(student_id, metric(date(2026, 9, 7))) for student_id in student_ids])
+    await db.commit()
+
+    with count_statements(engine) as statements:
+        rows, next_key = await crud.list_roster(db, limit=limit)
+    assert len(rows) == limit and next_key is not None
+    assert all(latest is not None for _, latest in rows)
+    assert len(statements) == 1, statements
@@ -0,0 +1,58 @@
+"""Conditional GET on /students/{id}: If-None-Match handling and ETag changes."""
+import pytest
+
+from app import crud
+from tests.conftest import student
+
+
+async def _student_id(db) -> int:
+    await crud.upsert_students(db, [student("S1", 9)])
+    await db.commit()
+    return (await crud.student_ids_by_local_id(db, ["S1"]))["S1"]
+
+
+@pytest.mark.asyncio
+async def test_matching_tag_returns_304(client, db):
+    student_id = await _student_id(db)
+    res = await client.get(f"/students/{student_id}")
+    assert res.status_code == 200
+    etag = res.headers["etag"]
+    assert res.headers["cache-control"] == "private, no-cache"
+
+    res = await client.get(f"/students/{student_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["etag"] == etag
+    assert res.content == b""
+
+    res = await client.get(f"/students/{student_id}", headers={"If-None-Match": '"something-else"'})
+    assert res.status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("header", ["*", '"other", W/{etag}', 'W/"other",{etag}'])
+async def test_star_and_weak_tag_lists_match(client, db, header):
+    student_id = await _student_id(db)
+    etag = (await client.get(f"/students/{student_id}")).headers["etag"]
+
+    res = await client.get(f"/students/{student_id}", headers={"If-None-Match": header.format(etag=etag)})
+    assert res.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_metric_write_and_student_edit_change_the_tag(client, db):
+    student_id = await _student_id(db)
+    first = (await client.get(f"/students/{student_id}")).headers["etag"]
+
+    res = await client.post(f"/metrics/students/{student_id}", json={"as_of_date": "2026-09-07", "attendance_percentage": 90.0})
+    assert res.status_code == 200
+    res = await client.get(f"/students/{student_id}", headers={"If-None-Match": first})
+    assert res.status_code == 200
+    assert res.json()["latest_metric"]["attendance_percentage"] == 90.0
+    second = res.headers["etag"]
+    assert second != first
+
+    res = await client.patch(f"/students/{student_id}", json={"grade_level": 10})
+    assert res.status_code == 200
+    res = await client.get(f"/students/{student_id}", headers={"If-None-Match": second})
+    assert res.status_code == 200
+    assert res.headers["etag"] not in (first, second)
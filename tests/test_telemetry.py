@@ -0,0 +1,30 @@
+"""Cursor hooks attribute each statement's own duration to the current request."""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.telemetry import RequestStats, current_request, install_query_hooks
+
+
+def test_failed_statement_leaves_no_timing_state_on_the_connection():
+    engine = create_engine("sqlite://")
+    install_query_hooks(SimpleNamespace(sync_engine=engine))
+    stats = RequestStats()
+    token = current_request.set(stats)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.rollback()
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+            assert "query_started" not in conn.info
+    finally:
+        current_request.reset(token)
+
+    # Only the statements that completed are counted, each with its own duration.
+    assert stats.queries == 2
+    assert [sql for _, sql in stats.statements] == ["SELECT 1", "SELECT 2"]
+    assert all(ms < 1000 for ms, _ in stats.statements)
@@ -0,0 +1,89 @@
+"""student_status_transitions must follow every write, including backdated ones."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app import crud
+from app.models import GrowthStatus, StudentStatus, StudentStatusTransition
+from tests.conftest import metric, student
+
+WEEK_1, WEEK_2, WEEK_3 = date(2026, 9, 7), date(2026, 9, 14), date(2026, 9, 21)
+
+ON_TRACK = {}
+WATCH = {"attendance": 90.0}
+AT_RISK = {"attendance": 90.0, "growth_status": GrowthStatus.below}
+
+
+async def _student(db) -> int:
+    await crud.upsert_students(db, [student("S1", 9)])
+    return (await crud.student_ids_by_local_id(db, ["S1"]))["S1"]
+
+
+async def _write(db, student_id: int, as_of_date: date, **inputs) -> None:
+    await crud.upsert_metrics(db, [crud.metric_values(student_id, metric(as_of_date, **inputs))])
+    await db.commit()
+
+
+async def _chain(db) -> list[tuple]:
+    res = await db.execute(select(StudentStatusTransition).order_by(StudentStatusTransition.as_of_date))
+    return [
+        (t.as_of_date, t.from_status, t.to_status, t.from_intervention, t.to_intervention)
+        for t in res.scalars().all()
+    ]
+
+
+async def _assert_matches_rebuild(db, chain: list[tuple]) -> None:
+    await crud.rebuild_status_transitions(db)
+    await db.commit()
+    assert await _chain(db) == chain
+
+
+@pytest.mark.asyncio
+async def test_backdated_write_repoints_the_successor(db):
+    student_id = await _student(db)
+    await _write(db, student_id, WEEK_1, **ON_TRACK)
+    await _write(db, student_id, WEEK_3, **AT_RISK)
+    assert await _chain(db) == [(WEEK_3, StudentStatus.on_track, StudentStatus.at_risk, False, True)]
+
+    await _write(db, student_id, WEEK_2, **WATCH)
+
+    chain = await _chain(db)
+    assert chain == [
+        (WEEK_2, StudentStatus.on_track, StudentStatus.watch, False, False),
+        (WEEK_3, StudentStatus.watch, StudentStatus.at_risk, False, True),
+    ]
+    await _assert_matches_rebuild(db, chain)
+
+
+@pytest.mark.asyncio
+async def test_backdated_write_removes_a_successor_transition_that_no_longer_changes(db):
+    student_id = await _student(db)
+    await _write(db, student_id, WEEK_1, **ON_TRACK)
+    await _write(db, student_id, WEEK_3, **WATCH)
+
+    await _write(db, student_id, WEEK_2, **WATCH)
+
+    chain = await _chain(db)
+    assert chain == [(WEEK_2, StudentStatus.on_track, StudentStatus.watch, False, False)]
+    await _assert_matches_rebuild(db, chain)
+
+
+@pytest.mark.asyncio
+async def test_rewrite_with_unchanged_status_keeps_the_chain(db):
+    student_id = await _student(db)
+    await _write(db, student_id, WEEK_1, **ON_TRACK)
+    await _write(db, student_id, WEEK_2, **WATCH)
+    await _write(db, student_id, WEEK_3, **WATCH)
+    res = await db.execute(select(StudentStatusTransition.id))
+    ids = set(res.scalars().all())
+
+    # New inputs, same status and intervention flag, for a middle and an end row.
+    await _write(db, student_id, WEEK_2, attendance=91.0)
+    await _write(db, student_id, WEEK_1, attendance=99.0)
+
+    chain = await _chain(db)
+    assert chain == [(WEEK_2, StudentStatus.on_track, StudentStatus.watch, False, False)]
+    res = await db.execute(select(StudentStatusTransition.id))
+    assert set(res.scalars().all()) == ids
+    await _assert_matches_rebuild(db, chain)